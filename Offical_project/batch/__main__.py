@@ -0,0 +1,52 @@
+# batch/__main__.py
+#
+# Usage (from Offical_project/):
+#     python -m batch jobs.json --result-dir result --workers 4
+
+import argparse
+import sys
+
+from batch.jobs import load_jobs
+from batch.runner import BatchRunner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m batch",
+        description="Run pair-trading jobs with a config-hashed result store",
+    )
+    parser.add_argument("job_file", help="JSON job file")
+    parser.add_argument(
+        "--result-dir", default="result",
+        help="result store root (default: result)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="max concurrent worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--parquet-dir", default=None,
+        help="also append results to a partitioned Parquet store",
+    )
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args.job_file)
+    report = BatchRunner(
+        jobs,
+        result_dir=args.result_dir,
+        max_workers=args.workers,
+        parquet_dir=args.parquet_dir,
+    ).run()
+
+    print(
+        f"{len(jobs)} jobs: {len(report['cached'])} cached, "
+        f"{len(report['done'])} done, {len(report['failed'])} failed"
+    )
+    for pair, key, err in report["failed"]:
+        print(f"[FAILED] {pair} {key}\n{err}", file=sys.stderr)
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# batch/jobs.py
+
+import hashlib
+import json
+from dataclasses import dataclass, field, asdict, fields
+from typing import Any, Dict, List
+
+from data.data_loader import DATA_DIR, _get_price_path
+from regime.config import RegimeConfig
+
+
+MODULE_KEYS = ("kalman", "zscore", "backtest", "regime")
+
+
+@dataclass
+class BatchJob:
+    """
+    One pair run: symbols + module parameters
+    """
+
+    symbol_x: str
+    symbol_y: str
+
+    data_dir: str = DATA_DIR
+    price_col: str = "close"
+    log_prices: bool = True
+
+    # Investing.com index file → RegimeClassifier market throttle
+    market_index: str | None = None
+
+    kalman: Dict[str, Any] = field(default_factory=dict)
+    zscore: Dict[str, Any] = field(default_factory=dict)
+    backtest: Dict[str, Any] = field(default_factory=dict)
+    regime: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def pair(self) -> str:
+        return f"{self.symbol_x}-{self.symbol_y}"
+
+    def regime_config(self) -> RegimeConfig:
+        return RegimeConfig(**self.regime)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# ==================================================
+# JOB FILE
+# ==================================================
+
+def load_jobs(path: str) -> List[BatchJob]:
+    """
+    Read a JSON job file:
+
+        {
+          "defaults": {
+            "data_dir": "data/ache",
+            "zscore": {"window": 20, "entry_z": 2.0},
+            "backtest": {"cost_per_turnover": 0.0005},
+            "regime": {"ADF_STEP": 10}
+          },
+          "jobs": [
+            {"symbol_x": "XOM", "symbol_y": "CVX"},
+            {"symbol_x": "XOM", "symbol_y": "CVX",
+             "zscore": {"window": 40}}
+          ]
+        }
+
+    Module dicts in a job are merged over the defaults.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    defaults = spec.get("defaults", {})
+    known = {f.name for f in fields(BatchJob)}
+
+    jobs = []
+    for raw in spec.get("jobs", []):
+        merged = {**defaults, **raw}
+        for key in MODULE_KEYS:
+            merged[key] = {
+                **defaults.get(key, {}),
+                **raw.get(key, {}),
+            }
+
+        unknown = set(merged) - known
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+
+        job = BatchJob(**merged)
+        job.regime_config()  # fail early on bad RegimeConfig keys
+        jobs.append(job)
+
+    return jobs
+
+
+# ==================================================
+# HASHING
+# ==================================================
+
+def job_hash(job: BatchJob, length: int = 16) -> str:
+    """
+    Hash of job parameters, full RegimeConfig and the bytes of
+    both input price files → changes whenever results could.
+    """
+    h = hashlib.sha256()
+
+    params = job.to_dict()
+    params.pop("data_dir")  # location is not content
+    params.pop("market_index")
+    params["regime"] = asdict(job.regime_config())
+
+    h.update(json.dumps(params, sort_keys=True).encode())
+
+    for symbol in (job.symbol_x, job.symbol_y):
+        h.update(_file_digest(_get_price_path(symbol, job.data_dir)))
+
+    if job.market_index is not None:
+        h.update(_file_digest(job.market_index))
+
+    return h.hexdigest()[:length]
+
+
+def _file_digest(path: str) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
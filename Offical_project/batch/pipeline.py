@@ -0,0 +1,101 @@
+# batch/pipeline.py
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import load_pair_prices
+from spread.kalman_beta import KalmanBeta
+from spread.builder import SpreadBuilder
+from regime.classifier import RegimeClassifier
+from regime.market import MarketStress, load_market_stress
+from trading_signals.zscore import ZScoreSignal
+from execution.backtest import SpreadBacktest
+from walk_forward.engine import WalkForwardEngine
+
+from batch.jobs import BatchJob
+
+
+def build_engine(job: BatchJob) -> WalkForwardEngine:
+    """
+    Wire one pair exactly like CF_midterm.ipynb:
+
+    load → log prices → KalmanBeta → spread
+         → RegimeClassifier → ZScoreSignal → SpreadBacktest
+    """
+    y, x = load_pair_prices(
+        job.symbol_y,
+        job.symbol_x,
+        price_col=job.price_col,
+        data_dir=job.data_dir,
+    )
+
+    if job.log_prices:
+        x, y = np.log(x), np.log(y)
+
+    beta = KalmanBeta(**job.kalman).run(x, y)
+    spread = SpreadBuilder.build(x, y, beta)
+
+    data = {
+        "x": x,
+        "y": y,
+        "spread": spread,
+        "beta": beta,
+        "dates": x.index,
+        "pair": job.pair,
+    }
+
+    if job.market_index is not None:
+        # parsed + scored once per worker process (lru_cache)
+        stress = load_market_stress(job.market_index)
+        data["market_stress"] = MarketStress.align(stress, x.index)
+
+    return WalkForwardEngine(
+        data=data,
+        modules=[
+            RegimeClassifier(job.regime_config()),
+            ZScoreSignal(**job.zscore),
+            SpreadBacktest(**job.backtest),
+        ],
+    )
+
+
+def timeline_length(job: BatchJob) -> int:
+    """
+    Bars build_engine(job) would walk (aligned pair prices),
+    without fitting the Kalman hedge
+    """
+    y, _ = load_pair_prices(
+        job.symbol_y,
+        job.symbol_x,
+        price_col=job.price_col,
+        data_dir=job.data_dir,
+    )
+    return len(y)
+
+
+def run_pair(job: BatchJob) -> Dict[str, pd.DataFrame]:
+    """
+    Run one job end to end.
+
+    Returns {"backtest": df, "signal": df, "regime": df},
+    each indexed by date.
+    """
+    wf = build_engine(job)
+    wf.run()
+    return collect_frames(wf)
+
+
+def collect_frames(wf: WalkForwardEngine) -> Dict[str, pd.DataFrame]:
+    """
+    Output frames of an engine built by build_engine
+    """
+    dates = wf.data["dates"]
+    frames = wf.frames(index=dates)
+
+    return {
+        "backtest": wf.modules[-1].finalize(index=dates),
+        "signal": frames["ZScoreSignal"],
+        "regime": frames["RegimeClassifier"],
+    }
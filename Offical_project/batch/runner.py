@@ -0,0 +1,197 @@
+# batch/runner.py
+
+import json
+import shutil
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+
+from batch.jobs import BatchJob, job_hash
+from batch.pipeline import run_pair
+from performance.rolling_metrics import RollingPerformanceMetrics
+
+
+SUCCESS_MARKER = "_SUCCESS"
+
+
+# ==================================================
+# RESULT STORE
+# ==================================================
+
+class ResultStore:
+    """
+    Config-hashed result directory
+
+        <root>/<pair>/<hash>/
+            job.json
+            backtest_results.csv
+            signal.csv
+            regime.csv
+            _SUCCESS          ← written last
+
+    A job is complete iff its _SUCCESS marker exists, so an
+    interrupted batch never mistakes partial output for a hit.
+    """
+
+    FILES = {
+        "backtest": "backtest_results.csv",
+        "signal": "signal.csv",
+        "regime": "regime.csv",
+    }
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, job: BatchJob, key: str) -> Path:
+        return self.root / job.pair / key
+
+    def is_done(self, job: BatchJob, key: str) -> bool:
+        return (self.path(job, key) / SUCCESS_MARKER).exists()
+
+    def write(self, job: BatchJob, key: str, frames: dict):
+        final = self.path(job, key)
+        tmp = final.with_name(final.name + ".tmp")
+
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+
+        with open(tmp / "job.json", "w", encoding="utf-8") as f:
+            json.dump({"hash": key, **job.to_dict()}, f, indent=2)
+
+        for name, df in frames.items():
+            df.to_csv(tmp / self.FILES[name])
+
+        (tmp / SUCCESS_MARKER).touch()
+
+        if final.exists():
+            shutil.rmtree(final)
+        tmp.rename(final)
+
+
+# ==================================================
+# WORKER
+# ==================================================
+
+def _run_job(
+    job: BatchJob,
+    key: str,
+    root: str,
+    parquet_dir: str | None = None,
+) -> str:
+    """
+    Process-pool entry point (top-level → picklable)
+    """
+    frames = run_pair(job)
+
+    if parquet_dir is not None:
+        # imported here: pyarrow is only needed for the columnar store
+        from storage.results_store import ParquetResultsStore
+
+        with ParquetResultsStore(parquet_dir) as store:
+            # an interrupted earlier attempt may have appended rows
+            # before _SUCCESS → replace the run, never duplicate it
+            store.drop_run(job.pair, key)
+            store.register_params(key, job.to_dict())
+            store.write_backtest(frames["backtest"], job.pair, key)
+            store.write_regime(frames["regime"], job.pair, key)
+            store.write_rolling(
+                RollingPerformanceMetrics(frames["backtest"], None).run(),
+                job.pair,
+                key,
+            )
+
+    ResultStore(root).write(job, key, frames)
+    return key
+
+
+# ==================================================
+# RUNNER
+# ==================================================
+
+class BatchRunner:
+    """
+    Run many BatchJobs with a concurrency limit
+
+    - Hash each job's inputs + config
+    - Skip jobs already in the store (cache hits)
+    - Run the rest on a process pool
+    - Resume after interruption: done jobs are hits
+    """
+
+    def __init__(
+        self,
+        jobs: List[BatchJob],
+        result_dir: str = "result",
+        max_workers: int = 1,
+        parquet_dir: str | None = None,
+    ):
+        """
+        parquet_dir : str | None
+            Also append every run to a ParquetResultsStore
+            (partitioned by pair / job hash)
+        """
+        self.jobs = jobs
+        self.store = ResultStore(result_dir)
+        self.max_workers = max_workers
+        self.parquet_dir = parquet_dir
+
+    def run(self) -> Dict[str, list]:
+        """
+        Returns {"cached": [...], "done": [...], "failed": [...]}
+        with (pair, hash[, error]) entries (hash None when the
+        inputs could not be hashed)
+        """
+        report = {"cached": [], "done": [], "failed": []}
+
+        todo = []
+        seen = set()
+        for job in self.jobs:
+            # hashing reads the price files: a missing / corrupt
+            # input fails this job only, not the whole batch
+            try:
+                key = job_hash(job)
+            except Exception:
+                report["failed"].append(
+                    (job.pair, None, traceback.format_exc(limit=3))
+                )
+                continue
+
+            if self.store.is_done(job, key):
+                report["cached"].append((job.pair, key))
+            elif (job.pair, key) not in seen:
+                todo.append((job, key))
+            seen.add((job.pair, key))
+
+        if self.max_workers <= 1:
+            for job, key in todo:
+                self._collect(report, job, key, lambda: _run_job(
+                    job, key, str(self.store.root), self.parquet_dir
+                ))
+            return report
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(
+                    _run_job, job, key, str(self.store.root),
+                    self.parquet_dir,
+                ):
+                (job, key)
+                for job, key in todo
+            }
+            for fut in as_completed(futures):
+                job, key = futures[fut]
+                self._collect(report, job, key, fut.result)
+
+        return report
+
+    @staticmethod
+    def _collect(report: dict, job: BatchJob, key: str, result):
+        try:
+            result()
+            report["done"].append((job.pair, key))
+        except Exception:
+            report["failed"].append(
+                (job.pair, key, traceback.format_exc(limit=3))
+            )
@@ -0,0 +1,319 @@
+# batch/sweep.py
+
+import math
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from batch.jobs import BatchJob, job_hash
+from batch.pipeline import build_engine, collect_frames, timeline_length
+from batch.runner import ResultStore
+from utility.compact import REGIME_CODES
+
+
+# ==================================================
+# PRUNING RULES
+# ==================================================
+
+@dataclass
+class PruneRules:
+    """
+    Hard stops checked at every milestone but the last: a run
+    that reached the full timeline is complete and kept
+    (None disables a rule)
+    """
+    max_drawdown: float | None = 0.30    # prune if dd deeper than -30%
+    max_broken: float | None = 0.50      # share of classified bars in BROKEN
+    min_trades: int | None = 1           # entries so far
+
+    def check(self, m: dict) -> str | None:
+        """
+        Reason string if the run should stop, else None
+        """
+        dd, broken, trades = m["max_drawdown"], m["broken_frac"], m["trades"]
+
+        if self.max_drawdown is not None and dd < -self.max_drawdown:
+            return f"drawdown {dd:.1%}"
+        if self.max_broken is not None and broken > self.max_broken:
+            return f"broken regime {broken:.0%} of bars"
+        if self.min_trades is not None and trades < self.min_trades:
+            return f"{trades} trades"
+        return None
+
+
+# ==================================================
+# INTERIM METRICS
+# ==================================================
+
+def interim_metrics(wf, freq: int = 252) -> dict:
+    """
+    Metrics of an engine run so far (build_engine layout)
+    """
+    bt = [o for o in wf.outputs["SpreadBacktest"] if o is not None]
+    pnl = np.array([o["pnl"] for o in bt], dtype=float)
+    equity = np.array([o["equity"] for o in bt], dtype=float)
+    # entries on the signal's own position: a regime multiplier
+    # of 0 (RESET / BROKEN) and back is not a new trade;
+    # warm-up (flat) outputs carry no raw_position
+    position = np.array([
+        o.get("raw_position", 0)
+        for o in wf.outputs.get("ZScoreSignal", []) if o is not None
+    ], dtype=float)
+
+    peak = np.maximum.accumulate(np.r_[1.0, equity])[1:]
+    dd = equity / peak - 1.0 if len(equity) else np.zeros(1)
+
+    held = position != 0
+    trades = int(np.sum(held & ~np.r_[False, held[:-1]]))
+
+    codes = [
+        REGIME_CODES.get(o.get("regime"), o.get("regime_code", -1))
+        if o is not None else -1
+        for o in wf.outputs.get("RegimeClassifier", [])
+    ]
+    codes = np.array([c for c in codes if c is not None and c >= 0])
+    broken = (
+        float(np.mean(codes == REGIME_CODES["BROKEN"])) if len(codes) else 0.0
+    )
+
+    std = pnl.std(ddof=1) if len(pnl) > 1 else 0.0
+    sharpe = pnl.mean() / std * np.sqrt(freq) if std > 0 else 0.0
+
+    return {
+        "bars": len(bt),
+        "equity": float(equity[-1]) if len(equity) else 1.0,
+        "sharpe": float(sharpe),
+        "max_drawdown": float(dd.min()),
+        "trades": trades,
+        "broken_frac": broken,
+    }
+
+
+# ==================================================
+# WORKER
+# ==================================================
+
+def _advance(job: BatchJob, end: int, checkpoint: str, final: bool):
+    """
+    Process-pool entry point: restore the job's engine (if it
+    has a checkpoint short of `end`), run up to `end`,
+    checkpoint again.
+
+    Returns (metrics, frames | None)
+    """
+    wf = build_engine(job)
+    if Path(checkpoint).exists():
+        wf.restore(checkpoint)
+        if wf.last_t is not None and wf.last_t >= end:
+            # past this milestone (stale file): interim metrics
+            # must come from bars < end → start over
+            wf = build_engine(job)
+
+    wf.end_index = end
+    wf.run()
+    wf.checkpoint(checkpoint)
+
+    frames = collect_frames(wf) if final else None
+    return interim_metrics(wf), frames
+
+
+# ==================================================
+# SUCCESSIVE HALVING
+# ==================================================
+
+class SuccessiveHalvingSweep:
+    """
+    Parameter sweep with early termination
+
+    - Every live job is advanced to the next milestone
+      (fraction of its timeline), resuming from its checkpoint
+    - PruneRules hard stops (drawdown, BROKEN share, no trades)
+      at the intermediate milestones
+    - Then only the best ceil(n / eta) by interim Sharpe are
+      promoted to the next milestone
+    - Survivors of the last milestone are complete runs and
+      go to the ResultStore like BatchRunner output
+    - report() lists every job: status, reason, the milestone
+      it stopped at and its metrics there
+
+    Compute used vs a full sweep: bars_simulated / bars_full.
+    Larger eta / earlier milestones prune harder; interim
+    Sharpe is noisy on short histories, so keep eta small
+    when the top few configurations must survive.
+    """
+
+    def __init__(
+        self,
+        jobs: List[BatchJob],
+        milestones=(0.25, 0.5, 1.0),
+        eta: float = 2.0,
+        min_keep: int = 2,
+        rules: PruneRules | None = None,
+        result_dir: str | None = "result",
+        checkpoint_dir: str | None = None,
+        max_workers: int = 1,
+    ):
+        if not milestones or milestones[-1] != 1.0:
+            raise ValueError("Last milestone must be 1.0 (full timeline)")
+
+        self.jobs = jobs
+        self.milestones = tuple(milestones)
+        self.eta = eta
+        self.min_keep = min_keep
+        self.rules = rules or PruneRules()
+        self.store = ResultStore(result_dir) if result_dir else None
+        self.max_workers = max_workers
+
+        self._tmp = None
+        if checkpoint_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="sweep-")
+            checkpoint_dir = self._tmp.name
+        self.checkpoint_dir = Path(checkpoint_dir)
+
+        self.rows: dict = {}
+        self.bars_simulated = 0
+        self.bars_full = 0
+
+    # ====================================================
+    # RUN
+    # ====================================================
+
+    def run(self) -> pd.DataFrame:
+        try:
+            return self._run()
+        finally:
+            if self._tmp is not None:
+                self._tmp.cleanup()
+
+    def _run(self) -> pd.DataFrame:
+        live = []
+        for i, job in enumerate(self.jobs):
+            # unreadable inputs → failed row (hash None), as BatchRunner
+            try:
+                key = job_hash(job)
+            except Exception:
+                self.rows[("unhashed", i)] = {
+                    "pair": job.pair,
+                    "param_hash": None,
+                    "status": "failed",
+                    "reason": traceback.format_exc(limit=3),
+                }
+                continue
+            if key in self.rows:
+                continue
+            self.rows[key] = {"pair": job.pair, "param_hash": key}
+            # a checkpoint left by an earlier sweep is not ours
+            self._checkpoint(key).unlink(missing_ok=True)
+            try:
+                T = timeline_length(job)
+            except Exception:
+                self.rows[key].update(
+                    status="failed", reason=traceback.format_exc(limit=3)
+                )
+                continue
+            self.bars_full += T
+            live.append((job, key, T))
+
+        for rung, frac in enumerate(self.milestones):
+            final = rung == len(self.milestones) - 1
+            results = self._advance_all(live, frac, final)
+
+            scored = []
+            for (job, key, T), (metrics, frames, error) in zip(live, results):
+                row = self.rows[key]
+                row.update(milestone=frac, **(metrics or {}))
+
+                if error is not None:
+                    row.update(status="failed", reason=error)
+                    continue
+
+                self.bars_simulated += metrics["bars"] - row.get("_bars", 0)
+                row["_bars"] = metrics["bars"]
+
+                # the last rung is the full run: report it, never prune
+                reason = None if final else self.rules.check(metrics)
+                if reason is not None:
+                    row.update(status="pruned", reason=reason)
+                elif final:
+                    row.update(status="done", reason=None)
+                    if self.store is not None:
+                        self.store.write(job, key, frames)
+                else:
+                    scored.append((metrics["sharpe"], job, key, T))
+
+            if final:
+                break
+
+            # ---------- promote the top 1 / eta ----------
+            scored.sort(key=lambda s: s[0], reverse=True)
+            keep = max(self.min_keep, math.ceil(len(scored) / self.eta))
+
+            for _, _, key, _ in scored[keep:]:
+                self.rows[key].update(
+                    status="pruned",
+                    reason=f"halving: not in top {keep} at {frac:.0%}",
+                )
+            live = [(job, key, T) for _, job, key, T in scored[:keep]]
+
+            if not live:
+                break
+
+        return self.report()
+
+    def _advance_all(self, live, frac: float, final: bool) -> list:
+        """
+        (metrics, frames, error) per live job
+        """
+        tasks = [
+            (
+                job,
+                int(math.ceil(frac * T)),
+                str(self._checkpoint(key)),
+                final,
+            )
+            for job, key, T in live
+        ]
+
+        if self.max_workers <= 1:
+            return [self._collect(lambda t=t: _advance(*t)) for t in tasks]
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(_advance, *t) for t in tasks]
+            return [self._collect(fut.result) for fut in futures]
+
+    def _checkpoint(self, key: str) -> Path:
+        return self.checkpoint_dir / f"{key}.pkl"
+
+    @staticmethod
+    def _collect(result):
+        try:
+            metrics, frames = result()
+            return metrics, frames, None
+        except Exception:
+            return None, None, traceback.format_exc(limit=3)
+
+    # ====================================================
+    # REPORT
+    # ====================================================
+
+    def report(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.rows.values())
+        df = df.drop(columns="_bars", errors="ignore")
+        if "sharpe" in df:
+            df = df.sort_values(
+                ["status", "sharpe"], ascending=[True, False]
+            ).reset_index(drop=True)
+        return df
+
+    @property
+    def compute_fraction(self) -> float:
+        """
+        Bars simulated / bars a full sweep would simulate
+        """
+        return self.bars_simulated / self.bars_full if self.bars_full else 0.0
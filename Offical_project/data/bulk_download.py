@@ -0,0 +1,289 @@
+# data/bulk_download.py
+
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import (
+    DATA_DIR,
+    _ensure_dir,
+    normalize_price_frame,
+    save_price,
+)
+
+
+# ==================================================
+# PROVIDERS
+# ==================================================
+
+class YahooProvider:
+    """
+    yfinance Ticker.history → cache columns
+    """
+
+    def fetch(
+        self,
+        symbol: str,
+        start: str,
+        end: str | None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        # imported here: offline runs (FakeProvider) need no yfinance
+        import yfinance as yf
+
+        df = yf.Ticker(symbol).history(
+            start=start, end=end, auto_adjust=auto_adjust
+        )
+        if df.empty:
+            raise ValueError(f"No data downloaded for {symbol}")
+        return normalize_price_frame(df, auto_adjust)
+
+
+class FakeProvider:
+    """
+    Offline provider for tests
+
+    - Deterministic GBM path per symbol (seeded by its name)
+      on business days in [start, end)
+    - flaky={symbol: n} → first n calls raise ConnectionError
+    - missing={...} → ValueError (no data, not retried)
+    - latency → seconds slept per call
+    """
+
+    def __init__(
+        self,
+        flaky: Dict[str, int] | None = None,
+        missing=(),
+        latency: float = 0.0,
+    ):
+        self.flaky = dict(flaky or {})
+        self.missing = set(missing)
+        self.latency = latency
+
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        symbol: str,
+        start: str,
+        end: str | None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        with self._lock:
+            n = self.calls.get(symbol, 0) + 1
+            self.calls[symbol] = n
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if symbol in self.missing:
+            raise ValueError(f"No data downloaded for {symbol}")
+        if n <= self.flaky.get(symbol, 0):
+            raise ConnectionError(f"Simulated failure {n} for {symbol}")
+
+        dates = pd.bdate_range(start, end or "2024-12-31", inclusive="left")
+        seed = int(hashlib.md5(symbol.encode()).hexdigest()[:8], 16)
+        rng = np.random.default_rng(seed)
+
+        close = 50.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.015, len(dates))))
+        spread = np.abs(rng.normal(0.0, 0.005, len(dates)))
+
+        df = pd.DataFrame({
+            "Open": close * (1 + rng.normal(0.0, 0.003, len(dates))),
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, len(dates)),
+        }, index=dates.rename("Date"))
+
+        return normalize_price_frame(df, auto_adjust)
+
+
+# ==================================================
+# RATE LIMIT
+# ==================================================
+
+class RateLimiter:
+    """
+    Token bucket shared by all worker threads:
+    `rate` requests per second, bursts up to `burst`
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._last) * self.rate
+                )
+                self._last = now
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+# ==================================================
+# BULK DOWNLOAD
+# ==================================================
+
+@dataclass
+class DownloadReport:
+    """
+    Outcome of one bulk download
+    """
+    ok: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    attempts: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+    def summary(self) -> str:
+        lines = [
+            f"{len(self.ok)} ok, {len(self.failed)} failed "
+            f"in {self.seconds:.1f}s"
+        ]
+        for symbol, error in sorted(self.failed.items()):
+            lines.append(f"  {symbol}: {error}")
+        return "\n".join(lines)
+
+
+class BulkDownloader:
+    """
+    Concurrent price refresh into the cache
+
+    - Thread pool of `max_workers` symbols in flight
+    - Shared token-bucket rate limit (requests / second)
+    - Exponential backoff with jitter:
+          wait = min(max_backoff, backoff * 2**(attempt - 1))
+      `permanent` errors (no data) are not retried
+    - Each symbol saved with save_price as soon as it arrives;
+      a local write failure (disk full, permissions) is
+      reported at once, never retried against the provider
+    - Failures are collected, never abort the batch
+    - provider: anything with fetch(symbol, start, end, auto_adjust)
+    """
+
+    def __init__(
+        self,
+        provider=None,
+        max_workers: int = 8,
+        rate: float = 2.0,
+        burst: int = 2,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        permanent: tuple = (ValueError,),
+        data_dir: str | None = None,
+        save: bool = True,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.provider = provider or YahooProvider()
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.permanent = permanent
+        self.data_dir = data_dir
+        self.save = save
+        self.sleep = sleep
+
+    def download(
+        self,
+        symbols: List[str],
+        start: str = "2000-01-01",
+        end: str | None = None,
+        auto_adjust: bool = True,
+    ) -> DownloadReport:
+        report = DownloadReport()
+        symbols = list(dict.fromkeys(symbols))
+
+        if self.save:
+            _ensure_dir(self.data_dir or DATA_DIR)
+
+        t0 = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                symbol: pool.submit(
+                    self._fetch_one, symbol, start, end, auto_adjust
+                )
+                for symbol in symbols
+            }
+
+        for symbol, fut in futures.items():
+            attempts, error = fut.result()
+            report.attempts[symbol] = attempts
+            if error is None:
+                report.ok.append(symbol)
+            else:
+                report.failed[symbol] = error
+
+        report.seconds = time.monotonic() - t0
+        return report
+
+    def _fetch_one(self, symbol, start, end, auto_adjust):
+        """
+        Returns (attempts, error message | None)
+        """
+        for attempt in range(1, self.retries + 2):
+            self.limiter.acquire()
+            try:
+                df = self.provider.fetch(symbol, start, end, auto_adjust)
+                if df is None or df.empty:
+                    raise ValueError(f"No data downloaded for {symbol}")
+                break
+
+            except self.permanent as exc:
+                return attempt, f"{type(exc).__name__}: {exc}"
+
+            except Exception as exc:
+                if attempt > self.retries:
+                    return attempt, f"{type(exc).__name__}: {exc}"
+
+                wait = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                self.sleep(wait * (0.5 + random.random() / 2))
+
+        # local write: a retry would only re-download the same data
+        if self.save:
+            try:
+                save_price(symbol, df, self.data_dir)
+            except Exception as exc:
+                return attempt, f"{type(exc).__name__}: {exc}"
+        return attempt, None
+
+
+def bulk_download(symbols: List[str], **kwargs) -> DownloadReport:
+    """
+    One-call refresh:
+    bulk_download(["XOM", "CVX"], start="2015-01-01", rate=1.0)
+    """
+    start = kwargs.pop("start", "2000-01-01")
+    end = kwargs.pop("end", None)
+    auto_adjust = kwargs.pop("auto_adjust", True)
+    return BulkDownloader(**kwargs).download(symbols, start, end, auto_adjust)
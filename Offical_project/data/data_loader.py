@@ -1,8 +1,8 @@
 # data/data_loader.py
 
 import os
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from typing import Tuple
 
 DATA_DIR = "data/cache"
@@ -23,6 +23,8 @@ def download_price(
     Returns DataFrame with columns:
     open, high, low, close, adj_close, volume
     """
+    # imported here: reading the cache needs no yfinance
+    import yfinance as yf
 
     ticker = yf.Ticker(symbol)
     df = ticker.history(
@@ -34,6 +36,22 @@ def download_price(
     if df.empty:
         raise ValueError(f"No data downloaded for {symbol}")
 
+    df = normalize_price_frame(df, auto_adjust)
+
+    if save:
+        save_price(symbol, df)
+
+    return df
+
+
+def normalize_price_frame(
+    df: pd.DataFrame,
+    auto_adjust: bool = True
+) -> pd.DataFrame:
+    """
+    Yahoo history() frame → cache columns
+    open, high, low, close, adj_close, volume
+    """
     # Chuẩn hóa column name
     df = df.rename(columns={
         "Open": "open",
@@ -49,12 +67,7 @@ def download_price(
     else:
         df["adj_close"] = df.get("Adj Close", df["close"])
 
-    df = df[["open", "high", "low", "close", "adj_close", "volume"]]
-
-    if save:
-        save_price(symbol, df)
-
-    return df
+    return df[["open", "high", "low", "close", "adj_close", "volume"]]
 # ==================================================
 # Core helpers
 # ==================================================
@@ -64,29 +77,30 @@ def _ensure_dir(path: str):
         os.makedirs(path)
 
 
-def _get_price_path(symbol: str) -> str:
-    return os.path.join(DATA_DIR, f"{symbol}.csv")
+def _get_price_path(symbol: str, data_dir: str | None = None) -> str:
+    return os.path.join(data_dir or DATA_DIR, f"{symbol}.csv")
 
 
 # ==================================================
 # Load & save single symbol
 # ==================================================
 
-def save_price(symbol: str, df: pd.DataFrame):
+def save_price(symbol: str, df: pd.DataFrame, data_dir: str | None = None):
     """
     Save price dataframe to cache.
     Expect columns: ['open', 'high', 'low', 'close', 'volume']
     """
-    _ensure_dir(DATA_DIR)
-    path = _get_price_path(symbol)
+    _ensure_dir(data_dir or DATA_DIR)
+    path = _get_price_path(symbol, data_dir)
     df.to_csv(path)
 
 
-def load_price(symbol: str) -> pd.DataFrame:
+def load_price(symbol: str, data_dir: str | None = None) -> pd.DataFrame:
     """
     Load cached price data for a symbol.
+    data_dir overrides DATA_DIR (e.g. per batch job).
     """
-    path = _get_price_path(symbol)
+    path = _get_price_path(symbol, data_dir)
     if not os.path.exists(path):
         raise FileNotFoundError(f"Price data for {symbol} not found")
 
@@ -101,14 +115,15 @@ def load_price(symbol: str) -> pd.DataFrame:
 def load_pair_prices(
     symbol_y: str,
     symbol_x: str,
-    price_col: str = "close"
+    price_col: str = "close",
+    data_dir: str | None = None,
 ) -> Tuple[pd.Series, pd.Series]:
     """
     Load and align price series for a trading pair.
     Returns aligned (y, x).
     """
-    df_y = load_price(symbol_y)
-    df_x = load_price(symbol_x)
+    df_y = load_price(symbol_y, data_dir)
+    df_x = load_price(symbol_x, data_dir)
 
     if price_col not in df_y.columns or price_col not in df_x.columns:
         raise ValueError(f"Column `{price_col}` not found in price data")
@@ -128,7 +143,8 @@ def load_pair_prices(
 
 def load_universe(
     symbols: list,
-    price_col: str = "close"
+    price_col: str = "close",
+    data_dir: str | None = None,
 ) -> pd.DataFrame:
     """
     Load multiple symbols into a single dataframe.
@@ -137,10 +153,179 @@ def load_universe(
     series_list = []
 
     for sym in symbols:
-        df = load_price(sym)
+        df = load_price(sym, data_dir)
         if price_col not in df.columns:
             raise ValueError(f"{price_col} not found for {sym}")
         series_list.append(df[price_col].rename(sym))
 
     df_all = pd.concat(series_list, axis=1).dropna()
     return df_all
+
+
+# ==================================================
+# Multi-ticker panel (yfinance.download layout)
+# ==================================================
+
+def load_panel_csv(
+    path: str,
+    field: str = "Close",
+    dropna: bool = True,
+) -> pd.DataFrame:
+    """
+    Load a yfinance multi-ticker CSV (e.g. data_10y.csv):
+
+        Price,  Close,  Close,  ...
+        Ticker, ACB.VN, BID.VN, ...
+        Date,   ,       ,       ...
+
+    Returns one field as a DataFrame, columns = tickers.
+    """
+    df = pd.read_csv(
+        path,
+        header=[0, 1],
+        index_col=0,
+        skiprows=[2],
+    )
+
+    if field not in df.columns.get_level_values(0):
+        raise ValueError(f"Field `{field}` not found in {path}")
+
+    panel = df[field]
+    panel.index = pd.to_datetime(panel.index)
+    panel.index.name = "Date"
+    panel.columns.name = None
+
+    if dropna:
+        panel = panel.dropna()
+    return panel
+
+
+# ==================================================
+# Investing.com index files (e.g. VNI.csv)
+# ==================================================
+
+INVESTING_COLUMNS = {
+    # Vietnamese export
+    "Ngày": "date",
+    "Lần cuối": "close",
+    "Mở": "open",
+    "Cao": "high",
+    "Thấp": "low",
+    "KL": "volume",
+    "% Thay đổi": "change_pct",
+    # English export
+    "Date": "date",
+    "Price": "close",
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Vol.": "volume",
+    "Change %": "change_pct",
+}
+
+VOLUME_SUFFIX = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+
+def load_investing_csv(
+    path: str,
+    cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Parse an Investing.com export into numeric columns.
+
+        "01/10/2025","1,665.05",...,"666.00M","0.20%"
+
+    - dd/mm/yyyy dates, thousands separators, K/M/B volume
+      suffixes and "%" strings converted with vectorized
+      string ops (no per-row Python parsing)
+    - Result cached as <DATA_DIR>/<name>.npz, reused while the
+      source file's size and mtime are unchanged
+
+    Returns DataFrame indexed by date (ascending) with columns:
+    open, high, low, close, volume, change_pct (fraction)
+    """
+    cache_path = os.path.join(
+        DATA_DIR,
+        os.path.splitext(os.path.basename(path))[0] + ".npz",
+    )
+    stamp = _file_stamp(path)
+
+    if cache and os.path.exists(cache_path):
+        df = _read_npz_frame(cache_path, stamp)
+        if df is not None:
+            return df
+
+    raw = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    raw = raw.rename(columns=INVESTING_COLUMNS)
+
+    missing = {"date", "close"} - set(raw.columns)
+    if missing:
+        raise ValueError(f"Not an Investing.com export, missing {missing}")
+
+    df = pd.DataFrame(index=pd.to_datetime(raw["date"], format="%d/%m/%Y"))
+    df.index.name = "date"
+
+    for col in ("open", "high", "low", "close"):
+        if col in raw:
+            df[col] = _to_number(raw[col]).to_numpy()
+
+    if "volume" in raw:
+        df["volume"] = _parse_volume(raw["volume"]).to_numpy()
+
+    if "change_pct" in raw:
+        pct = raw["change_pct"].str.rstrip("%")
+        df["change_pct"] = (_to_number(pct) / 100.0).to_numpy()
+
+    df = df.sort_index()
+
+    if cache:
+        _write_npz_frame(cache_path, df, stamp)
+
+    return df
+
+
+def _to_number(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(
+        s.str.replace(",", "", regex=False).str.strip(),
+        errors="coerce",
+    )
+
+
+def _parse_volume(s: pd.Series) -> pd.Series:
+    s = s.str.strip()
+    suffix = s.str[-1].str.upper()
+    mult = suffix.map(VOLUME_SUFFIX)
+
+    has_suffix = mult.notna()
+    number = _to_number(s.where(~has_suffix, s.str[:-1]))
+    return number * mult.fillna(1.0)
+
+
+def _file_stamp(path: str) -> np.ndarray:
+    st = os.stat(path)
+    return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def _write_npz_frame(path: str, df: pd.DataFrame, stamp: np.ndarray):
+    _ensure_dir(os.path.dirname(path) or ".")
+    np.savez(
+        path,
+        _stamp=stamp,
+        _index=df.index.to_numpy(dtype="datetime64[ns]").astype(np.int64),
+        _columns=np.array(df.columns, dtype=str),
+        **{f"col_{c}": df[c].to_numpy(dtype=float) for c in df.columns},
+    )
+
+
+def _read_npz_frame(path: str, stamp: np.ndarray) -> pd.DataFrame | None:
+    with np.load(path) as z:
+        if not np.array_equal(z["_stamp"], stamp):
+            return None
+
+        index = pd.DatetimeIndex(
+            z["_index"].astype("datetime64[ns]"), name="date"
+        )
+        return pd.DataFrame(
+            {c: z[f"col_{c}"] for c in z["_columns"]},
+            index=index,
+        )
@@ -0,0 +1,236 @@
+# data/synthetic.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import DATA_DIR, save_price
+from utility.time_series import TimeSeriesStats
+
+
+KINDS = ("coint", "break", "drift", "random")
+
+
+class SyntheticUniverse:
+    """
+    Vectorized generator of synthetic price series with
+    known structure (log prices, no intercept, matching
+    SpreadBuilder: log x = beta * log y + s)
+
+        coint  : s is an OU / AR(1) with a planted half-life
+        break  : OU until `break_date`, random walk after
+                 (cointegration lost at a known bar)
+        drift  : OU spread, beta_t follows a random walk
+                 (what KalmanBeta should track)
+        random : x and y independent random walks
+
+    All series of a kind are simulated together: one
+    (n_pairs, n_bars) array per kind, AR(1) recursion
+    vectorized across pairs.
+    """
+
+    def __init__(
+        self,
+        n_bars: int = 2520,
+        start: str = "2015-01-01",
+        seed: int = 0,
+        vol: float = 0.015,
+        spread_vol: float = 0.05,
+        half_life_range: tuple = (5, 60),
+        beta_range: tuple = (0.6, 1.4),
+        beta_drift: float = 0.002,
+    ):
+        self.n_bars = n_bars
+        self.start = start
+        self.vol = vol
+        self.spread_vol = spread_vol
+        self.half_life_range = half_life_range
+        self.beta_range = beta_range
+        self.beta_drift = beta_drift
+
+        self.rng = np.random.default_rng(seed)
+        self.dates = pd.bdate_range(start, periods=n_bars, name="Date")
+
+    # ====================================================
+    # GENERATE
+    # ====================================================
+
+    def generate(
+        self,
+        n_coint: int = 100,
+        n_break: int = 100,
+        n_drift: int = 100,
+        n_random: int = 100,
+    ) -> tuple:
+        """
+        Returns (close, truth)
+
+        close : DataFrame (dates x symbols), price levels
+        truth : one row per pair: symbol_x, symbol_y, kind,
+                half_life, beta, break_bar, break_date
+        """
+        counts = dict(zip(KINDS, (n_coint, n_break, n_drift, n_random)))
+
+        logs, truth = [], []
+        n_done = 0
+        for kind, n in counts.items():
+            if n <= 0:
+                continue
+            log_x, log_y, info = self._pairs(kind, n)
+
+            ids = np.arange(n_done + 1, n_done + n + 1)
+            sx = [f"SYN{i:05d}X" for i in ids]
+            sy = [f"SYN{i:05d}Y" for i in ids]
+
+            # columns x1, y1, x2, y2, ...
+            both = np.empty((self.n_bars, 2 * n))
+            both[:, 0::2] = log_x.T
+            both[:, 1::2] = log_y.T
+            cols = [s for pair in zip(sx, sy) for s in pair]
+            logs.append(pd.DataFrame(both, index=self.dates, columns=cols))
+
+            info = pd.DataFrame(info)
+            info.insert(0, "kind", kind)
+            info.insert(0, "symbol_y", sy)
+            info.insert(0, "symbol_x", sx)
+            truth.append(info)
+            n_done += n
+
+        close = np.exp(pd.concat(logs, axis=1))
+        truth = pd.concat(truth, ignore_index=True)
+        truth["break_date"] = [
+            self.dates[b] if b >= 0 else pd.NaT for b in truth["break_bar"]
+        ]
+        return close, truth
+
+    def _pairs(self, kind: str, n: int) -> tuple:
+        T = self.n_bars
+        rng = self.rng
+
+        log_y = np.log(50.0) + np.cumsum(
+            rng.normal(0.0, self.vol, (n, T)), axis=1
+        )
+
+        lo, hi = np.log(self.half_life_range)
+        half_life = np.exp(rng.uniform(lo, hi, n))
+        beta0 = rng.uniform(*self.beta_range, n)
+        break_bar = np.full(n, -1)
+
+        if kind == "random":
+            log_x = np.log(50.0) + np.cumsum(
+                rng.normal(0.0, self.vol, (n, T)), axis=1
+            )
+            half_life = np.full(n, np.inf)
+            beta0 = np.full(n, np.nan)
+            return log_x, log_y, {
+                "half_life": half_life, "beta": beta0, "break_bar": break_bar
+            }
+
+        phi = np.exp(-np.log(2.0) / half_life)
+        phi = np.repeat(phi[:, None], T, axis=1)
+
+        if kind == "break":
+            break_bar = rng.integers(T // 3, 2 * T // 3, n)
+            after = np.arange(T)[None, :] >= break_bar[:, None]
+            phi[after] = 1.0
+
+        spread = self._ar1(phi)
+
+        beta = np.repeat(beta0[:, None], T, axis=1)
+        if kind == "drift":
+            beta = beta + np.cumsum(
+                rng.normal(0.0, self.beta_drift, (n, T)), axis=1
+            )
+
+        log_x = beta * log_y + spread
+        return log_x, log_y, {
+            "half_life": half_life, "beta": beta0, "break_bar": break_bar
+        }
+
+    def _ar1(self, phi: np.ndarray) -> np.ndarray:
+        """
+        s_t = phi_t * s_{t-1} + e_t; e has the innovation std
+        that gives stationary std spread_vol under the starting
+        phi, kept after a break (phi → 1 then random-walks at
+        the same shock size); looped over time, vectorized over
+        series
+        """
+        n, T = phi.shape
+        sd = self.spread_vol * np.sqrt(1.0 - phi[:, :1] ** 2)
+        eps = self.rng.normal(0.0, 1.0, (n, T)) * sd
+
+        s = np.empty((n, T))
+        s[:, 0] = self.rng.normal(0.0, self.spread_vol, n)
+        for t in range(1, T):
+            s[:, t] = phi[:, t] * s[:, t - 1] + eps[:, t]
+        return s
+
+    # ====================================================
+    # PRICE CACHE
+    # ====================================================
+
+    def write_cache(
+        self,
+        close: pd.DataFrame,
+        truth: pd.DataFrame | None = None,
+        data_dir: str | None = None,
+    ):
+        """
+        One <symbol>.csv per column in the price cache layout
+        (open, high, low, close, adj_close, volume), plus
+        _truth.csv with the planted parameters
+        """
+        data_dir = data_dir or DATA_DIR
+        n, T = close.shape[1], close.shape[0]
+
+        rng = self.rng
+        wiggle = np.abs(rng.normal(0.0, 0.004, (T, n)))
+        c = close.to_numpy()
+        opens = c * (1.0 + rng.normal(0.0, 0.003, (T, n)))
+        highs = np.maximum(c, opens) * (1.0 + wiggle)
+        lows = np.minimum(c, opens) * (1.0 - wiggle)
+        volume = rng.integers(100_000, 5_000_000, (T, n))
+
+        for i, symbol in enumerate(close.columns):
+            df = pd.DataFrame({
+                "open": opens[:, i],
+                "high": highs[:, i],
+                "low": lows[:, i],
+                "close": c[:, i],
+                "adj_close": c[:, i],
+                "volume": volume[:, i],
+            }, index=close.index)
+            save_price(symbol, df, data_dir)
+
+        if truth is not None:
+            truth.to_csv(os.path.join(data_dir, "_truth.csv"), index=False)
+
+
+# ==================================================
+# RECOVERY CHECK
+# ==================================================
+
+def half_life_recovery(
+    close: pd.DataFrame,
+    truth: pd.DataFrame,
+    kinds=("coint", "break"),
+) -> pd.DataFrame:
+    """
+    TimeSeriesStats.half_life on each planted spread
+    (true beta, pre-break bars) vs the planted value
+    """
+    rows = truth[truth["kind"].isin(kinds)]
+    log = np.log(close)
+
+    est = []
+    for r in rows.itertuples():
+        spread = log[r.symbol_x] - r.beta * log[r.symbol_y]
+        if r.break_bar >= 0:
+            spread = spread.iloc[: r.break_bar]
+        est.append(TimeSeriesStats.half_life(spread))
+
+    out = rows[["symbol_x", "symbol_y", "kind", "half_life"]].copy()
+    out["estimated"] = est
+    out["ratio"] = out["estimated"] / out["half_life"]
+    return out.reset_index(drop=True)
@@ -1,14 +1,23 @@
 # diagnostics/spread_stability.py
 
 import numpy as np
-from statsmodels.tsa.stattools import adfuller, coint
 from utility.time_series import TimeSeriesStats
 
 
 class SpreadStability:
 
+    WEIGHTS = {
+        "coint_stab": 0.35,
+        "adf_stab": 0.30,
+        "hl_stab": 0.20,
+        "hurst_stab": 0.15,
+    }
+
     @staticmethod
     def rolling_adf(spread, window=90, step=5):
+        # statsmodels imported on first use, not at module load
+        from statsmodels.tsa.stattools import adfuller
+
         flags = []
         for i in range(window, len(spread), step):
             p = adfuller(spread[i-window:i])[1]
@@ -17,6 +26,8 @@ class SpreadStability:
 
     @staticmethod
     def rolling_coint(x, y, window=180, step=10):
+        from statsmodels.tsa.stattools import coint
+
         flags = []
         for i in range(window, len(x), step):
             p = coint(x[i-window:i], y[i-window:i])[1]
@@ -48,14 +59,15 @@ class SpreadStability:
             "hurst_stab": SpreadStability.rolling_hurst(spread),
         }
 
-        weights = {
-            "coint_stab": 0.35,
-            "adf_stab": 0.30,
-            "hl_stab": 0.20,
-            "hurst_stab": 0.15,
-        }
+        return SpreadStability.combine(scores)
 
-        stab = sum(scores[k] * weights[k] for k in scores)
+    @staticmethod
+    def combine(scores: dict) -> dict:
+        """
+        Weighted stability score from the four flag fractions
+        """
+        weights = SpreadStability.WEIGHTS
+        stab = sum(scores[k] * weights[k] for k in weights)
 
         return {
             **scores,
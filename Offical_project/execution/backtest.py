@@ -4,6 +4,29 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from utility.compact import SlotRecord, records_to_frame
+
+
+class BacktestRecord(SlotRecord):
+    """
+    Per-bar execution log entry (compact mode)
+    """
+
+    __slots__ = (
+        "t", "position", "spread_ret", "turnover",
+        "cost", "pnl", "equity",
+    )
+
+    DTYPES = {
+        "t": "int32",
+        "position": "float32",
+        "spread_ret": "float32",
+        "turnover": "float32",
+        "cost": "float32",
+        "pnl": "float32",
+        "equity": "float64",  # compounded → keep full precision
+    }
+
 
 class SpreadBacktest:
     """
@@ -16,6 +39,7 @@ class SpreadBacktest:
         cost_per_turnover: float = 0.0,
         slippage: float = 0.0,
         output_path: str | None = None,
+        compact: bool = False,
     ):
         """
         Parameters
@@ -28,16 +52,27 @@ class SpreadBacktest:
 
         output_path : str | None
             If provided → save csv after run
+
+        compact : bool
+            If True → log BacktestRecord (__slots__) instead of dicts
+            and finalize to float32 columns
         """
         self.cost = cost_per_turnover
         self.slippage = slippage
         self.output_path = output_path
+        self.compact = compact
 
         self.prev_position = 0.0
         self.equity = 1.0
 
         # ---- logger ----
-        self.records: list[dict] = []
+        self.records: list = []
+
+    # bars of history needed before t (spread[t - 1])
+    lookback = 1
+
+    # walk-forward graph
+    inputs = ("ZScoreSignal",)
 
     # ====================================================
     # WALK-FORWARD STEP
@@ -80,15 +115,15 @@ class SpreadBacktest:
 
         self.prev_position = position
 
-        out = {
-            "t": t,
-            "position": position,
-            "spread_ret": spread_ret,
-            "turnover": turnover,
-            "cost": trade_cost,
-            "pnl": pnl,
-            "equity": self.equity,
-        }
+        out = self._record(
+            t=t,
+            position=position,
+            spread_ret=spread_ret,
+            turnover=turnover,
+            cost=trade_cost,
+            pnl=pnl,
+            equity=self.equity,
+        )
 
         self.records.append(out)
         return out
@@ -101,10 +136,13 @@ class SpreadBacktest:
         """
         Convert logs to DataFrame and optionally save csv
         """
-        df = pd.DataFrame(self.records)
+        if self.compact:
+            df = records_to_frame(self.records, index=index)
+        else:
+            df = pd.DataFrame(self.records)
 
-        if index is not None and len(index) == len(df):
-            df.index = index
+            if index is not None and len(index) == len(df):
+                df.index = index
 
         if self.output_path is not None:
             Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
@@ -112,17 +150,44 @@ class SpreadBacktest:
 
         return df
 
+    def on_flush(self):
+        """
+        Called by ChunkedWalkForwardEngine once records are on disk
+        """
+        self.records.clear()
+
     # ====================================================
-    # HELPERS
+    # STATE
     # ====================================================
 
-    def _empty_step(self, t):
+    def get_state(self) -> dict:
         return {
-            "t": t,
-            "position": 0.0,
-            "spread_ret": 0.0,
-            "turnover": 0.0,
-            "cost": 0.0,
-            "pnl": 0.0,
+            "prev_position": self.prev_position,
             "equity": self.equity,
+            "records": list(self.records),
         }
+
+    def set_state(self, state: dict):
+        self.prev_position = state["prev_position"]
+        self.equity = state["equity"]
+        self.records = list(state["records"])
+
+    # ====================================================
+    # HELPERS
+    # ====================================================
+
+    def _empty_step(self, t):
+        return self._record(
+            t=t,
+            position=0.0,
+            spread_ret=0.0,
+            turnover=0.0,
+            cost=0.0,
+            pnl=0.0,
+            equity=self.equity,
+        )
+
+    def _record(self, **values):
+        if self.compact:
+            return BacktestRecord(**values)
+        return values
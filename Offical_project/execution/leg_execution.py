@@ -0,0 +1,212 @@
+# execution/leg_execution.py
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import load_panel_csv
+
+
+HEDGES = ("dollar", "shares")
+LEG_FIELDS = ("open", "close", "volume")
+
+
+class LegExecution:
+    """
+    Leg-level execution of a pair signal (vectorized over the
+    whole timeline)
+
+    Inputs:
+        position : ZScoreSignal position (-1 / 0 / +1), decided
+                   on the close of bar t
+        beta     : hedge ratio per bar (KalmanBeta / HedgeRatio)
+        x, y     : leg OHLCV frames (load_price / from_panel),
+                   columns open, close, volume
+
+    Sizing (target at the close of t):
+        dollar : $x = pos * capital, $y = -beta * $x
+                 (beta fitted on log prices)
+        shares : q_x = pos * capital / close_x, q_y = -beta * q_x
+                 (beta fitted on price levels)
+        rehedge=False → leg sizes are fixed when the position
+        changes and held until the next change; True → resized
+        to the current beta every bar.
+
+    Fills at the open of t + 1. Bar PnL in $:
+        h[t-1] · (open[t] - close[t-1])     overnight, old book
+      + h[t]   · (close[t] - open[t])       after the fill
+
+    Costs per leg on traded notional n = |Δq| * open:
+        commission  n * cost_per_notional
+        slippage    n * (half_spread + impact * (n / ADV)^exponent)
+    ADV = mean(close * volume) over adv_window bars before t
+    (square-root market impact by default).
+
+    ret = pnl / capital, equity = cumprod(1 + ret) as in
+    SpreadBacktest.
+    """
+
+    def __init__(
+        self,
+        capital: float = 1_000_000.0,
+        hedge: str = "dollar",
+        rehedge: bool = False,
+        cost_per_notional: float = 0.0,
+        half_spread: float = 0.0,
+        impact: float = 0.1,
+        impact_exponent: float = 0.5,
+        adv_window: int = 20,
+    ):
+        if hedge not in HEDGES:
+            raise ValueError(f"hedge must be one of {HEDGES}")
+
+        self.capital = capital
+        self.hedge = hedge
+        self.rehedge = rehedge
+        self.cost = cost_per_notional
+        self.half_spread = half_spread
+        self.impact = impact
+        self.exponent = impact_exponent
+        self.adv_window = adv_window
+
+    # ====================================================
+    # INPUT
+    # ====================================================
+
+    @staticmethod
+    def from_panel(path: str, symbol: str) -> pd.DataFrame:
+        """
+        One leg (open, close, volume) from a yfinance
+        multi-ticker CSV (e.g. data_10y.csv)
+        """
+        return pd.DataFrame({
+            f: load_panel_csv(path, field=f.capitalize(), dropna=False)[
+                symbol
+            ]
+            for f in LEG_FIELDS
+        })
+
+    # ====================================================
+    # RUN
+    # ====================================================
+
+    def run(
+        self,
+        position: pd.Series,
+        beta,
+        x: pd.DataFrame,
+        y: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """
+        Returns per-bar frame: position, shares_x, shares_y,
+        traded_x, traded_y (notional), participation_x / _y,
+        commission, slippage, cost, pnl ($), ret, equity
+        """
+        index = position.index
+        pos = np.nan_to_num(position.to_numpy(dtype=float))
+
+        if np.isscalar(beta):
+            b = np.full(len(index), float(beta))
+        else:
+            b = beta.reindex(index).ffill().to_numpy(dtype=float)
+        b = np.nan_to_num(b)
+
+        xo, xc, xv = self._leg(x, index)
+        yo, yc, yv = self._leg(y, index)
+
+        # ---------- target shares at the close of t ----------
+        if self.hedge == "dollar":
+            qx = pos * self.capital / xc
+            qy = -b * pos * self.capital / yc
+        else:
+            qx = pos * self.capital / xc
+            qy = -b * qx
+
+        if not self.rehedge:
+            # sizes of the last bar where the position changed
+            change = np.r_[True, pos[1:] != pos[:-1]]
+            bar = np.where(change, np.arange(len(pos)), 0)
+            last = np.maximum.accumulate(bar)
+            qx, qy = qx[last], qy[last]
+
+        qx = np.nan_to_num(qx)
+        qy = np.nan_to_num(qy)
+
+        # ---------- held after the open fill of t ----------
+        hx = np.r_[0.0, qx[:-1]]
+        hy = np.r_[0.0, qy[:-1]]
+
+        pnl = self._leg_pnl(hx, xo, xc) + self._leg_pnl(hy, yo, yc)
+
+        # ---------- costs ----------
+        traded_x = np.abs(np.diff(hx, prepend=0.0)) * xo
+        traded_y = np.abs(np.diff(hy, prepend=0.0)) * yo
+        part_x = self._participation(traded_x, xc, xv)
+        part_y = self._participation(traded_y, yc, yv)
+
+        traded = traded_x + traded_y
+        commission = traded * self.cost
+        slippage = (
+            traded * self.half_spread
+            + self.impact * (
+                traded_x * part_x ** self.exponent
+                + traded_y * part_y ** self.exponent
+            )
+        )
+        cost = commission + slippage
+        pnl = pnl - cost
+
+        ret = pnl / self.capital
+
+        return pd.DataFrame({
+            "position": pos,
+            "shares_x": hx,
+            "shares_y": hy,
+            "traded_x": traded_x,
+            "traded_y": traded_y,
+            "participation_x": part_x,
+            "participation_y": part_y,
+            "commission": commission,
+            "slippage": slippage,
+            "cost": cost,
+            "pnl": pnl,
+            "ret": ret,
+            "equity": np.cumprod(1.0 + ret),
+        }, index=index)
+
+    # ====================================================
+    # HELPERS
+    # ====================================================
+
+    @staticmethod
+    def _leg(df: pd.DataFrame, index) -> tuple:
+        df = df.reindex(index)
+        close = df["close"].ffill().to_numpy(dtype=float)
+        # missing open → no gap, fill at the previous close
+        prev = np.r_[close[0], close[:-1]]
+        opens = df["open"].to_numpy(dtype=float)
+        opens = np.where(np.isnan(opens), prev, opens)
+        volume = df["volume"].to_numpy(dtype=float)
+        return opens, close, volume
+
+    @staticmethod
+    def _leg_pnl(held, opens, close) -> np.ndarray:
+        prev_close = np.r_[np.nan, close[:-1]]
+        prev_held = np.r_[0.0, held[:-1]]
+        gap = np.nan_to_num(prev_held * (opens - prev_close))
+        day = np.nan_to_num(held * (close - opens))
+        return gap + day
+
+    def _participation(self, traded, close, volume) -> np.ndarray:
+        """
+        Traded notional / ADV known before the bar
+        """
+        adv = (
+            pd.Series(close * volume)
+            .rolling(self.adv_window, min_periods=1)
+            .mean()
+            .shift(1)
+            .to_numpy()
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            part = np.where(adv > 0, traded / adv, 0.0)
+        return np.nan_to_num(part)
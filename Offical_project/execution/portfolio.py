@@ -0,0 +1,190 @@
+# execution/portfolio.py
+
+import numpy as np
+import pandas as pd
+
+
+ALLOCATIONS = ("equal", "inverse_vol")
+
+
+class PortfolioBacktest:
+    """
+    Vectorized multi-pair backtest (one combined book)
+
+    Inputs are T x pairs matrices, columns = "X-Y" pair keys
+    (BatchJob.pair):
+
+        positions   : ZScoreSignal raw positions (-1 / 0 / +1)
+        spreads     : x - beta * y, as fed to SpreadBacktest
+        betas       : hedge ratio per bar (→ leg netting)
+        prices      : leg prices on the same scale as the spread
+                      (log prices), columns = symbols
+        multipliers : RegimeClassifier.position_multiplier,
+                      caps each pair's allocation (0..1)
+
+    Allocation (weight of pair p at t, decided on data < t):
+        equal       : 1 / n_pairs
+        inverse_vol : ∝ 1 / rolling std of Δspread (vol_window)
+        then × clip(multiplier, 0, 1), capped at max_weight
+
+    With betas + prices, pair exposures are mapped onto legs
+        H[t] = Σ_p w·pos (e_x - beta · e_y)
+    so shared legs net out; PnL = H[t-1] · Δprice[t] and cost
+    is charged on net leg turnover. Without them the book is
+    the weighted sum of pair spreads (no netting).
+
+    Same bar timing as SpreadBacktest:
+        pnl[t] = exposure[t-1] · Δ[t] - cost(turnover at t)
+        equity = cumprod(1 + pnl)
+    """
+
+    def __init__(
+        self,
+        cost_per_turnover: float = 0.0,
+        slippage: float = 0.0,
+        allocation: str = "equal",
+        vol_window: int = 60,
+        max_weight: float | None = None,
+    ):
+        if allocation not in ALLOCATIONS:
+            raise ValueError(f"allocation must be one of {ALLOCATIONS}")
+
+        self.cost = cost_per_turnover
+        self.slippage = slippage
+        self.allocation = allocation
+        self.vol_window = vol_window
+        self.max_weight = max_weight
+
+        self.weights: pd.DataFrame | None = None
+        self.holdings: pd.DataFrame | None = None
+
+    # ====================================================
+    # RUN
+    # ====================================================
+
+    def run(
+        self,
+        positions: pd.DataFrame,
+        spreads: pd.DataFrame,
+        betas: pd.DataFrame | None = None,
+        prices: pd.DataFrame | None = None,
+        multipliers: pd.DataFrame | None = None,
+        legs: dict | None = None,
+    ) -> pd.DataFrame:
+        """
+        Returns per-bar book: pnl, cost, turnover (net),
+        gross_turnover (before netting), exposure, equity
+        """
+        pairs = list(positions.columns)
+        index = positions.index
+
+        pos = positions.to_numpy(dtype=float)
+        spread = spreads.reindex(index=index, columns=pairs)
+        spread = spread.to_numpy(dtype=float)
+        d_spread = np.diff(spread, axis=0, prepend=np.nan)
+
+        w = self._weights(d_spread, multipliers, index, pairs)
+        self.weights = pd.DataFrame(w, index=index, columns=pairs)
+
+        exposure = np.nan_to_num(w * pos)
+
+        if betas is not None and prices is not None:
+            pnl, turnover, gross, held = self._leg_book(
+                exposure, betas, prices, legs, index, pairs
+            )
+            gross_exposure = np.abs(held).sum(axis=1)
+        else:
+            pnl = np.nansum(exposure[:-1] * d_spread[1:], axis=1)
+            pnl = np.r_[0.0, pnl]
+            turnover = np.abs(np.diff(exposure, axis=0, prepend=0.0))
+            turnover = turnover.sum(axis=1)
+            gross = turnover
+            gross_exposure = np.abs(exposure).sum(axis=1)
+
+        cost = turnover * (self.cost + self.slippage)
+        pnl = pnl - cost
+
+        return pd.DataFrame({
+            "pnl": pnl,
+            "cost": cost,
+            "turnover": turnover,
+            "gross_turnover": gross,
+            "exposure": gross_exposure,
+            "equity": np.cumprod(1.0 + pnl),
+        }, index=index)
+
+    # ====================================================
+    # ALLOCATION
+    # ====================================================
+
+    def _weights(self, d_spread, multipliers, index, pairs) -> np.ndarray:
+        T, P = d_spread.shape
+
+        if self.allocation == "equal":
+            w = np.full((T, P), 1.0 / P)
+        else:
+            vol = (
+                pd.DataFrame(d_spread)
+                .rolling(self.vol_window)
+                .std()
+                .shift(1)           # data < t
+                .to_numpy()
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                inv = np.where(vol > 0, 1.0 / vol, np.nan)
+                w = inv / np.nansum(inv, axis=1, keepdims=True)
+            w = np.nan_to_num(w)
+
+        if multipliers is not None:
+            m = multipliers.reindex(index=index, columns=pairs)
+            w = w * np.clip(np.nan_to_num(m.to_numpy(dtype=float)), 0.0, 1.0)
+
+        if self.max_weight is not None:
+            w = np.minimum(w, self.max_weight)
+
+        return w
+
+    # ====================================================
+    # LEG NETTING
+    # ====================================================
+
+    def _leg_book(self, exposure, betas, prices, legs, index, pairs):
+        """
+        Map pair exposures onto legs with incidence matrices:
+            H = E @ Lx - (E * beta) @ Ly
+        """
+        legs = legs or {p: tuple(p.split("-", 1)) for p in pairs}
+        symbols = list(prices.columns)
+        col = {s: i for i, s in enumerate(symbols)}
+
+        missing = {s for p in pairs for s in legs[p]} - set(col)
+        if missing:
+            raise KeyError(f"No prices for legs {sorted(missing)}")
+
+        P, N = len(pairs), len(symbols)
+        Lx = np.zeros((P, N))
+        Ly = np.zeros((P, N))
+        for i, p in enumerate(pairs):
+            x, y = legs[p]
+            Lx[i, col[x]] = 1.0
+            Ly[i, col[y]] = 1.0
+
+        beta = np.nan_to_num(
+            betas.reindex(index=index, columns=pairs).to_numpy(dtype=float)
+        )
+        held = exposure @ Lx - (exposure * beta) @ Ly
+
+        px = prices.reindex(index).to_numpy(dtype=float)
+        d_px = np.nan_to_num(np.diff(px, axis=0))
+
+        pnl = np.r_[0.0, np.einsum("tn,tn->t", held[:-1], d_px)]
+
+        turnover = np.abs(np.diff(held, axis=0, prepend=0.0)).sum(axis=1)
+
+        # same trades without netting: each pair's legs on their own
+        d_exp = np.diff(exposure, axis=0, prepend=0.0)
+        d_hedge = np.diff(exposure * beta, axis=0, prepend=0.0)
+        gross = np.abs(d_exp).sum(axis=1) + np.abs(d_hedge).sum(axis=1)
+
+        self.holdings = pd.DataFrame(held, index=index, columns=symbols)
+        return pnl, turnover, gross, held
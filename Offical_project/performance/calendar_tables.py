@@ -0,0 +1,225 @@
+# performance/calendar_tables.py
+
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from utility.compact import REGIME_LABELS, REGIME_CODES
+
+
+FREQS = ("M", "Q", "Y")
+RUN_KEYS = ["pair", "param_hash"]
+
+
+class CalendarTables:
+    """
+    Calendar-period performance over many backtest runs at once
+
+    Input: one long panel, one row per (run, bar)
+
+        pair | param_hash | date | equity [| regime_code / regime]
+
+    (ParquetResultsStore.query("backtest") output, or
+    CalendarTables.from_runs({...}))
+
+    Every run × period gets an integer group code
+
+        code = run_id * n_periods + period_ordinal - first_ordinal
+
+    and all metrics come from np.bincount / ufunc.reduceat over
+    those codes → one grouped pass per frequency, no per-run loop.
+
+    Metrics per (run, period):
+        return        compounded
+        vol           std * sqrt(freq)
+        sharpe        mean / std * sqrt(freq)
+                      (annualized as in RollingPerformanceMetrics)
+        max_drawdown  within the period, from its starting equity
+        n_bars
+        time_<REGIME> fraction of bars per regime (if present)
+    """
+
+    def __init__(
+        self,
+        freq: int = 252,
+        equity_col: str = "equity",
+        date_col: str = "date",
+        regime_col: str = "regime_code",
+    ):
+        self.freq = freq
+        self.equity_col = equity_col
+        self.date_col = date_col
+        self.regime_col = regime_col
+
+    # ======================================================
+    # INPUT
+    # ======================================================
+
+    @staticmethod
+    def from_runs(runs: Dict[tuple, pd.DataFrame]) -> pd.DataFrame:
+        """
+        {(pair, param_hash): SpreadBacktest.finalize(index=dates)}
+        → long panel
+        """
+        frames = []
+        for (pair, key), df in runs.items():
+            df = df.copy()
+            dates = pd.to_datetime(df.index, utc=True).tz_localize(None)
+            df.insert(0, "date", dates)
+            df["pair"] = pair
+            df["param_hash"] = key
+            frames.append(df.reset_index(drop=True))
+        return pd.concat(frames, ignore_index=True)
+
+    # ======================================================
+    # TABLES
+    # ======================================================
+
+    def compute(
+        self,
+        panel: pd.DataFrame,
+        freqs: Iterable[str] = FREQS,
+        regime: pd.DataFrame | None = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        {"M": table, "Q": table, "Y": table}
+
+        regime : long regime panel (ParquetResultsStore.query
+            ("regime")) joined on pair / param_hash / date
+        """
+        if regime is not None:
+            panel = panel.drop(columns=[self.regime_col], errors="ignore")
+            panel = panel.merge(
+                regime[[*RUN_KEYS, self.date_col, self.regime_col]],
+                on=[*RUN_KEYS, self.date_col],
+                how="left",
+            )
+        panel = panel.sort_values([*RUN_KEYS, self.date_col], kind="stable")
+
+        run_id, runs = pd.MultiIndex.from_frame(
+            panel[RUN_KEYS].astype(str)
+        ).factorize()
+        run_id = run_id.astype(np.int64)
+
+        dates = pd.DatetimeIndex(pd.to_datetime(panel[self.date_col]))
+        equity = panel[self.equity_col].to_numpy(dtype=float)
+
+        # per-bar return within each run (first bar → 0)
+        ret = np.zeros(len(equity))
+        ret[1:] = equity[1:] / equity[:-1] - 1.0
+        ret[np.r_[True, run_id[1:] != run_id[:-1]]] = 0.0
+        ret = np.nan_to_num(ret, nan=0.0, posinf=0.0, neginf=0.0)
+
+        regime = self._regime_codes(panel)
+
+        return {
+            f: self._table(f, run_id, runs, dates, ret, regime)
+            for f in freqs
+        }
+
+    def _table(self, freq, run_id, runs, dates, ret, regime) -> pd.DataFrame:
+        ordinal = self._ordinals(dates, freq)
+        first = ordinal.min()
+        n_periods = ordinal.max() - first + 1
+
+        code = run_id * n_periods + (ordinal - first)
+        # rows are sorted by (run, date) → codes are contiguous blocks
+        starts = np.flatnonzero(np.r_[True, code[1:] != code[:-1]])
+        group = np.cumsum(np.r_[False, code[1:] != code[:-1]])
+        keys = code[starts]
+
+        n = np.diff(np.r_[starts, len(code)]).astype(float)
+        s1 = np.add.reduceat(ret, starts)
+        s2 = np.add.reduceat(ret * ret, starts)
+        log_r = np.log1p(ret)
+        total = np.expm1(np.add.reduceat(log_r, starts))
+
+        mean = s1 / n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (s2 - n * mean ** 2) / (n - 1)
+            std = np.sqrt(np.clip(var, 0.0, None))
+            sharpe = np.where(std > 0, mean / std * np.sqrt(self.freq), np.nan)
+
+        table = pd.DataFrame({
+            "pair": runs.get_level_values(0)[keys // n_periods],
+            "param_hash": runs.get_level_values(1)[keys // n_periods],
+            "period": pd.PeriodIndex.from_ordinals(
+                keys % n_periods + first, freq=freq
+            ),
+            "return": total,
+            "vol": std * np.sqrt(self.freq),
+            "sharpe": sharpe,
+            "max_drawdown": self._max_drawdown(log_r, group, starts),
+            "n_bars": n.astype(np.int64),
+        })
+
+        if regime is not None:
+            k = len(REGIME_LABELS)
+            valid = regime >= 0
+            counts = np.bincount(
+                group[valid] * k + regime[valid],
+                minlength=len(starts) * k,
+            ).reshape(len(starts), k)
+            for i, label in enumerate(REGIME_LABELS):
+                table[f"time_{label}"] = counts[:, i] / n
+
+        return table
+
+    # ======================================================
+    # HELPERS
+    # ======================================================
+
+    @staticmethod
+    def _ordinals(dates: pd.DatetimeIndex, freq: str) -> np.ndarray:
+        """
+        Integer period codes, equal to pd.Period ordinals
+        """
+        year = dates.year.to_numpy().astype(np.int64) - 1970
+        if freq == "M":
+            return year * 12 + dates.month.to_numpy() - 1
+        if freq == "Q":
+            return year * 4 + dates.quarter.to_numpy() - 1
+        if freq == "Y":
+            return year
+        raise ValueError(f"freq must be one of {FREQS}")
+
+    @staticmethod
+    def _max_drawdown(log_r, group, starts) -> np.ndarray:
+        """
+        Per-group max drawdown from the group's starting equity.
+
+        Cumulative log equity is offset by group * span so that one
+        global maximum.accumulate never carries a peak across
+        group boundaries.
+        """
+        c = np.cumsum(log_r)
+        base = np.r_[0.0, c][starts][group]
+        rel = c - base
+
+        span = 2.0 * np.abs(rel).max() + 1.0
+        peak = np.maximum.accumulate(rel + group * span) - group * span
+        peak = np.maximum(peak, 0.0)
+
+        dd = np.expm1(rel - peak)
+        return np.minimum.reduceat(dd, starts)
+
+    def _regime_codes(self, panel: pd.DataFrame) -> np.ndarray | None:
+        if self.regime_col in panel:
+            codes = panel[self.regime_col].to_numpy()
+        elif "regime" in panel:
+            codes = panel["regime"].map(REGIME_CODES).to_numpy()
+        else:
+            return None
+        return np.nan_to_num(codes.astype(float), nan=-1).astype(np.int64)
+
+    @staticmethod
+    def pivot(table: pd.DataFrame, value: str = "sharpe") -> pd.DataFrame:
+        """
+        Monthly table of one run → year × month grid
+        (notebook-style monthly Sharpe heatmap)
+        """
+        period = table["period"].dt
+        return table.assign(year=period.year, month=period.month).pivot(
+            index="year", columns="month", values=value
+        )
@@ -3,17 +3,19 @@
 import pandas as pd
 import numpy as np
 
+from utility.rolling_moments import RollingMoments
+
 
 class RollingPerformanceMetrics:
     """
     Rolling / time-series performance metrics
-    Read from backtest CSV and export rolling metrics to CSV
+    Read from backtest CSV (or DataFrame) and export rolling metrics to CSV
     """
 
     def __init__(
         self,
-        csv_path: str,
-        output_path: str,
+        csv_path: str | pd.DataFrame,
+        output_path: str | None,
         freq: int = 252,
         equity_col: str = "equity",
         pnl_col: str = "pnl",
@@ -33,12 +35,18 @@ class RollingPerformanceMetrics:
 
         self.df = self._load()
 
+        # one prefix-sum pass over returns, any window after that
+        self.moments = RollingMoments(self.df["returns"])
+
     # ======================================================
     # LOAD
     # ======================================================
 
     def _load(self) -> pd.DataFrame:
-        df = pd.read_csv(self.csv_path)
+        if isinstance(self.csv_path, pd.DataFrame):
+            df = self.csv_path.copy()
+        else:
+            df = pd.read_csv(self.csv_path)
 
         if self.date_col in df:
             df[self.date_col] = pd.to_datetime(df[self.date_col])
@@ -53,16 +61,16 @@ class RollingPerformanceMetrics:
     # ======================================================
 
     def rolling_sharpe(self, window: int) -> pd.Series:
-        r = self.df["returns"]
-        mean = r.rolling(window).mean()
-        std = r.rolling(window).std()
+        mean = self.moments.mean(window)
+        std = self.moments.std(window)
 
-        sharpe = mean / std * np.sqrt(self.freq)
-        return sharpe
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = mean / std * np.sqrt(self.freq)
+        return self.moments.series(sharpe)
 
     def rolling_volatility(self, window: int) -> pd.Series:
-        r = self.df["returns"]
-        return r.rolling(window).std() * np.sqrt(self.freq)
+        std = self.moments.std(window)
+        return self.moments.series(std * np.sqrt(self.freq))
 
     def rolling_drawdown(self) -> pd.Series:
         equity = self.df[self.equity_col]
@@ -136,5 +144,6 @@ class RollingPerformanceMetrics:
                 self.rolling_regime_exposure(regime_window)
             )
 
-        out.to_csv(self.output_path)
+        if self.output_path is not None:
+            out.to_csv(self.output_path)
         return out
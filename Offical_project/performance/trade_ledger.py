@@ -0,0 +1,322 @@
+# performance/trade_ledger.py
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from performance.calendar_tables import RUN_KEYS
+from utility.compact import REGIME_CODES, regime_categorical
+from utility.time_series import TimeSeriesStats
+
+
+class TradeLedger:
+    """
+    Round-trip trades from per-bar backtest logs (one run or a
+    whole sweep panel), without a per-bar loop
+
+    Input: one row per (run, bar), rows of a run contiguous and
+    sorted by date
+
+        [pair | param_hash |] date | position | pnl | cost
+        [| z] [| regime_code / regime]
+
+    (TradeLedger.from_frames(run_pair(job)), or the long
+    ParquetResultsStore.query("backtest") panel)
+
+    A trade is a maximal run of bars with the same non-zero
+    position sign (run-length encoding over sign and run id);
+    resizing by the regime multiplier stays in the trade, a
+    flip closes one trade and opens the next.
+
+    Bar timing as in SpreadBacktest (pnl[t] earns position[t-1]):
+        entry bar  s      first bar with the new sign
+        exit bar   e + 1  first bar after the run (its pnl is the
+                          last one the trade earns)
+        gross      Σ pnl + cost over bars s + 1 .. e + 1
+        cost       turnover cost of bars s .. e + 1; on a flip
+                   the bar's cost is split by |old| : |new|
+    Trades still open at the end of a run have open=True and
+    exit at the last bar.
+    """
+
+    def __init__(
+        self,
+        date_col: str = "date",
+        position_col: str = "position",
+        pnl_col: str = "pnl",
+        cost_col: str = "cost",
+        z_col: str = "z",
+        regime_col: str = "regime_code",
+    ):
+        self.date_col = date_col
+        self.position_col = position_col
+        self.pnl_col = pnl_col
+        self.cost_col = cost_col
+        self.z_col = z_col
+        self.regime_col = regime_col
+
+    # ======================================================
+    # INPUT
+    # ======================================================
+
+    @staticmethod
+    def from_frames(
+        frames: Dict[str, pd.DataFrame],
+        pair: str | None = None,
+        param_hash: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        run_pair / collect_frames output → one-run panel
+        (backtest position / pnl / cost + signal z + regime)
+        """
+        bt = frames["backtest"]
+        dates = pd.to_datetime(bt.index, utc=True).tz_localize(None)
+        panel = pd.DataFrame({
+            "date": dates,
+            "position": bt["position"].to_numpy(),
+            "pnl": bt["pnl"].to_numpy(),
+            "cost": bt["cost"].to_numpy(),
+        })
+
+        signal = frames.get("signal")
+        if signal is not None and "z" in signal:
+            panel["z"] = signal["z"].to_numpy()
+
+        regime = frames.get("regime")
+        if regime is not None:
+            if "regime_code" in regime:
+                panel["regime_code"] = regime["regime_code"].to_numpy()
+            elif "regime" in regime:
+                panel["regime_code"] = (
+                    regime["regime"].map(REGIME_CODES).fillna(-1).to_numpy()
+                )
+
+        if pair is not None:
+            panel.insert(0, "param_hash", param_hash)
+            panel.insert(0, "pair", pair)
+        return panel
+
+    # ======================================================
+    # LEDGER
+    # ======================================================
+
+    def extract(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        One row per round trip:
+
+        [pair, param_hash,] trade, direction, entry_date,
+        exit_date, entry_z, exit_z, bars, holding_days,
+        gross_pnl, cost, pnl, max_size, regime_at_entry, open
+        """
+        keys = [k for k in RUN_KEYS if k in panel]
+        if len(panel) == 0:
+            # e.g. a query() that matched no run
+            return self._empty(panel, keys)
+
+        pos = np.nan_to_num(panel[self.position_col].to_numpy(dtype=float))
+        pnl = np.nan_to_num(panel[self.pnl_col].to_numpy(dtype=float))
+        cost = (
+            np.nan_to_num(panel[self.cost_col].to_numpy(dtype=float))
+            if self.cost_col in panel else np.zeros(len(panel))
+        )
+        sign = np.sign(pos)
+        n = len(pos)
+
+        # ---------- run-length encoding ----------
+        # rows are contiguous per run → a run starts where any key
+        # changes (per-column integer codes, no tuple factorize)
+        new_run = np.zeros(n, dtype=bool)
+        new_run[:1] = True
+        for key in keys:
+            code = pd.factorize(panel[key])[0]
+            new_run[1:] |= code[1:] != code[:-1]
+        new_seg = new_run | np.r_[True, sign[1:] != sign[:-1]]
+        starts = np.flatnonzero(new_seg)
+        ends = np.r_[starts[1:], n] - 1
+
+        is_trade = sign[starts] != 0
+        entry = starts[is_trade]
+        last = ends[is_trade]
+        k = len(entry)
+
+        # exit on the next bar unless the run ends first
+        run_end = np.r_[np.flatnonzero(new_run)[1:], n] - 1
+        end_of_run = run_end[np.searchsorted(
+            np.flatnonzero(new_run), entry, side="right"
+        ) - 1]
+        is_open = last >= end_of_run
+        exit_ = np.where(is_open, last, last + 1)
+
+        # trade id per bar (-1 = flat) and of the previous bar
+        seg = np.cumsum(new_seg) - 1
+        seg_trade = np.full(len(starts), -1)
+        seg_trade[is_trade] = np.arange(k)
+        tid = seg_trade[seg]
+        prev = np.r_[-1, tid[:-1]]
+        prev[new_run] = -1
+
+        # ---------- PnL / cost attribution ----------
+        gross = pnl + cost
+        held = prev >= 0
+        gross_pnl = np.bincount(prev[held], gross[held], minlength=k)
+
+        old = np.abs(np.r_[0.0, pos[:-1]])
+        old[new_run] = 0.0
+        new = np.abs(pos)
+        same = prev == tid
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(same, 1.0, old / (old + new))
+        share = np.nan_to_num(share)
+
+        to_prev = held
+        to_cur = (tid >= 0) & ~same
+        trade_cost = (
+            np.bincount(prev[to_prev], (cost * share)[to_prev], minlength=k)
+            + np.bincount(
+                tid[to_cur], (cost * (1.0 - share))[to_cur], minlength=k
+            )
+        )
+
+        max_size = np.zeros(k)
+        in_trade = tid >= 0
+        np.maximum.at(max_size, tid[in_trade], new[in_trade])
+
+        # ---------- ledger ----------
+        dates = pd.DatetimeIndex(pd.to_datetime(panel[self.date_col]))
+        entry_date = dates[entry]
+        exit_date = dates[exit_]
+
+        ledger = pd.DataFrame({
+            "trade": np.arange(k),
+            "direction": sign[entry].astype(np.int8),
+            "entry_date": entry_date,
+            "exit_date": exit_date,
+            "entry_z": self._column(panel, self.z_col, entry),
+            "exit_z": self._column(panel, self.z_col, exit_),
+            "bars": exit_ - entry,
+            "holding_days": (exit_date - entry_date).days,
+            "gross_pnl": gross_pnl,
+            "cost": trade_cost,
+            "pnl": gross_pnl - trade_cost,
+            "max_size": max_size,
+            "regime_at_entry": self._regimes(panel, entry),
+            "open": is_open,
+        })
+
+        if keys:
+            for i, key in enumerate(keys):
+                ledger.insert(i, key, panel[key].to_numpy()[entry])
+            r = (np.cumsum(new_run) - 1)[entry]
+            # trade number restarts per run
+            first = np.r_[0, np.flatnonzero(np.diff(r)) + 1]
+            counts = np.diff(np.r_[first, k])
+            ledger["trade"] = np.arange(k) - np.repeat(first, counts)
+
+        return ledger
+
+    # ======================================================
+    # HOLDING PERIOD VS HALF-LIFE
+    # ======================================================
+
+    @staticmethod
+    def half_lives(spreads: Dict[str, pd.Series]) -> pd.Series:
+        """
+        {pair: spread} → TimeSeriesStats.half_life per pair
+        """
+        return pd.Series(
+            {p: TimeSeriesStats.half_life(s) for p, s in spreads.items()},
+            name="half_life",
+        )
+
+    @staticmethod
+    def holding_summary(
+        ledger: pd.DataFrame,
+        half_life=None,
+    ) -> pd.DataFrame:
+        """
+        Per run: trades, win rate, mean / median bars held,
+        and median bars / half_life (≈ 1–2 for a spread that
+        reverts as estimated; >> 1 → exits lag the reversion)
+
+        half_life : float, or Series indexed by pair (the
+                    ledger must then have a pair column)
+        """
+        keys = [k for k in RUN_KEYS if k in ledger]
+        closed = ledger[~ledger["open"]]
+        grouped = closed.groupby(keys) if keys else closed.groupby(
+            np.zeros(len(closed), dtype=int)
+        )
+
+        out = grouped.agg(
+            trades=("pnl", "size"),
+            win_rate=("pnl", lambda p: float(np.mean(p > 0))),
+            pnl=("pnl", "sum"),
+            cost=("cost", "sum"),
+            mean_bars=("bars", "mean"),
+            median_bars=("bars", "median"),
+        ).reset_index()
+        if not keys:
+            out = out.drop(columns="index")
+
+        if half_life is not None:
+            if np.isscalar(half_life):
+                out["half_life"] = float(half_life)
+            elif "pair" not in out:
+                raise ValueError(
+                    "half_life per pair needs a ledger with a pair "
+                    "column; pass a float for a single run"
+                )
+            else:
+                out["half_life"] = out["pair"].map(half_life).to_numpy()
+            out["holding_ratio"] = out["median_bars"] / out["half_life"]
+        return out
+
+    # ======================================================
+    # HELPERS
+    # ======================================================
+
+    def _empty(self, panel: pd.DataFrame, keys: list) -> pd.DataFrame:
+        """
+        Zero-trade ledger with the extract() schema
+        """
+        none = np.array([], dtype=np.int64)
+        dates = pd.DatetimeIndex(
+            pd.to_datetime(panel[self.date_col])
+            if self.date_col in panel else []
+        )
+        ledger = pd.DataFrame({
+            "trade": none,
+            "direction": none.astype(np.int8),
+            "entry_date": dates,
+            "exit_date": dates,
+            "entry_z": none.astype(float),
+            "exit_z": none.astype(float),
+            "bars": none,
+            "holding_days": none,
+            "gross_pnl": none.astype(float),
+            "cost": none.astype(float),
+            "pnl": none.astype(float),
+            "max_size": none.astype(float),
+            "regime_at_entry": regime_categorical(none),
+            "open": none.astype(bool),
+        })
+        for i, key in enumerate(keys):
+            ledger.insert(i, key, panel[key].iloc[:0].array)
+        return ledger
+
+    @staticmethod
+    def _column(panel: pd.DataFrame, col: str, rows) -> np.ndarray:
+        if col not in panel:
+            return np.full(len(rows), np.nan)
+        return panel[col].to_numpy(dtype=float)[rows]
+
+    def _regimes(self, panel: pd.DataFrame, rows) -> pd.Categorical:
+        if self.regime_col in panel:
+            codes = panel[self.regime_col].to_numpy()
+        elif "regime" in panel:
+            codes = panel["regime"].map(REGIME_CODES).to_numpy()
+        else:
+            codes = np.full(len(panel), -1)
+        codes = np.nan_to_num(codes.astype(float), nan=-1)
+        return regime_categorical(codes[rows])
@@ -5,7 +5,44 @@ import pandas as pd
 
 from utility.stat_tests import StatTests
 from utility.time_series import TimeSeriesStats
+from utility.compact import SlotRecord, regime_code, regime_label
+from utility.rolling_moments import shared_moments
 from regime.config import RegimeConfig
+from regime.scheduler import AdaptiveScheduler
+from regime.market import MarketStress
+
+
+class RegimeRecord(SlotRecord):
+    """
+    Flat, fixed-schema regime output (compact mode)
+    """
+
+    __slots__ = (
+        "t", "regime_code", "position_multiplier",
+        "structural", "mr", "coupling", "shock",
+        "adf_p", "coint_p", "hurst", "half_life", "corr",
+        "market_stress",
+    )
+
+    DTYPES = {
+        "t": "int32",
+        "regime_code": "int8",
+        "position_multiplier": "float32",
+        "structural": "float32",
+        "mr": "float32",
+        "coupling": "float32",
+        "shock": "float32",
+        "adf_p": "float32",
+        "coint_p": "float32",
+        "hurst": "float32",
+        "half_life": "float32",
+        "corr": "float32",
+        "market_stress": "float32",
+    }
+
+    @property
+    def regime(self) -> str | None:
+        return regime_label(self.regime_code)
 
 
 class RegimeClassifier:
@@ -24,8 +61,30 @@ class RegimeClassifier:
         "BROKEN": 0.0,
     }
 
-    def __init__(self, config: RegimeConfig | None = None):
+    def __init__(
+        self,
+        config: RegimeConfig | None = None,
+        compact: bool = False,
+        scheduler: AdaptiveScheduler | None = None,
+        correlation=None,
+    ):
+        """
+        compact : bool
+            If True → return RegimeRecord (int8 regime code,
+            flat float32 schema) instead of nested dicts
+
+        scheduler : AdaptiveScheduler | None
+            If provided → heavy stats refresh on detected changes
+            (+ staleness bound) instead of t % *_STEP clocks
+
+        correlation : RollingCorrelation | None
+            Shared universe correlation engine, also in the
+            engine's module list (updated there before this step)
+        """
         self.config = config or RegimeConfig()
+        self.compact = compact
+        self.scheduler = scheduler
+        self.correlation = correlation
 
         # cached heavy metrics
         self._adf_p = None
@@ -34,6 +93,23 @@ class RegimeClassifier:
 
         self.last_regime = None
 
+    # walk-forward graph: optional shared universe correlation
+    inputs = ("RollingCorrelation",)
+
+    @property
+    def lookback(self) -> int:
+        """
+        Bars of history needed before t
+        """
+        return self.config.MIN_WINDOW
+
+    @property
+    def warmup(self) -> int:
+        """
+        evaluate() returns None before MIN_WINDOW → engine skips it
+        """
+        return self.config.MIN_WINDOW
+
     # ====================================================
     # MAIN WALK-FORWARD STEP
     # ====================================================
@@ -44,9 +120,24 @@ class RegimeClassifier:
         x: pd.Series,
         y: pd.Series,
         spread: pd.Series,
+        beta: pd.Series | None = None,
+        corr: float | None = None,
+        market_stress: float | None = None,
     ) -> dict | None:
         """
         Evaluate regime at time t using only data <= t
+
+        beta (Kalman beta series) only feeds the adaptive
+        scheduler's beta-jump detector
+
+        corr : float | None
+            Precomputed coupling correlation (e.g. from a shared
+            RollingCorrelation); default → StatTests.corr on
+            the last CORR_WINDOW bars
+
+        market_stress : float | None
+            Market-factor stress in [0, 1] (MarketStress); throttles
+            position_multiplier, does not change the regime label
         """
 
         W = self.config.MIN_WINDOW
@@ -64,21 +155,25 @@ class RegimeClassifier:
         # HEAVY METRICS (CACHED + THROTTLED)
         # =================================================
 
+        if self.scheduler is not None:
+            beta_w = None if beta is None else beta.iloc[t - W : t]
+            self.scheduler.observe(t, s_w, beta_w)
+
         # ADF
-        if self._adf_p is None or t % self.config.ADF_STEP == 0:
+        if self._due("adf", self._adf_p, t, self.config.ADF_STEP):
             self._adf_p = StatTests.adf_test(
                 s_w.iloc[-self.config.ADF_WINDOW :]
             )["p_value"]
 
         # COINTEGRATION
-        if self._coint_p is None or t % self.config.COINT_STEP == 0:
+        if self._due("coint", self._coint_p, t, self.config.COINT_STEP):
             self._coint_p = StatTests.cointegration_test(
                 x_w.iloc[-self.config.COINT_WINDOW :],
                 y_w.iloc[-self.config.COINT_WINDOW :],
             )["p_value"]
 
         # HURST
-        if self._hurst is None or t % self.config.HURST_STEP == 0:
+        if self._due("hurst", self._hurst, t, self.config.HURST_STEP):
             self._hurst = TimeSeriesStats.hurst_exponent(
                 s_w.iloc[-self.config.HURST_WINDOW :]
             )
@@ -87,10 +182,11 @@ class RegimeClassifier:
         # LIGHT METRICS (DAILY)
         # =================================================
 
-        corr = StatTests.corr(
-            x_w.iloc[-self.config.CORR_WINDOW :],
-            y_w.iloc[-self.config.CORR_WINDOW :],
-        )
+        if corr is None:
+            corr = StatTests.corr(
+                x_w.iloc[-self.config.CORR_WINDOW :],
+                y_w.iloc[-self.config.CORR_WINDOW :],
+            )
 
         half_life = TimeSeriesStats.half_life(s_w)
 
@@ -107,7 +203,7 @@ class RegimeClassifier:
         )
 
         coupling_score = np.clip(abs(corr), 0.0, 1.0)
-        shock_score = self._shock_score(s_w)
+        shock_score = self._shock_score(spread, t, W)
 
         # =================================================
         # REGIME STATE MACHINE
@@ -130,14 +226,41 @@ class RegimeClassifier:
 
         self.last_regime = regime
 
+        multiplier = self.position_multiplier(regime)
+        if market_stress is not None:
+            multiplier *= MarketStress.throttle(
+                market_stress,
+                self.config.MARKET_THROTTLE,
+                self.config.MARKET_STRESS_CUTOFF,
+            )
+
         # =================================================
         # OUTPUT
         # =================================================
 
+        if self.compact:
+            return RegimeRecord(
+                t=t,
+                regime_code=regime_code(regime),
+                position_multiplier=multiplier,
+                structural=float(structural_score),
+                mr=float(mr_score),
+                coupling=float(coupling_score),
+                shock=shock_score,
+                adf_p=float(self._adf_p),
+                coint_p=float(self._coint_p),
+                hurst=float(self._hurst),
+                half_life=float(half_life),
+                corr=float(corr),
+                market_stress=(
+                    np.nan if market_stress is None else float(market_stress)
+                ),
+            )
+
         return {
             "t": t,
             "regime": regime,
-            "position_multiplier": self.position_multiplier(regime),
+            "position_multiplier": multiplier,
             "scores": {
                 "structural": structural_score,
                 "mr": mr_score,
@@ -150,9 +273,22 @@ class RegimeClassifier:
                 "hurst": self._hurst,
                 "half_life": half_life,
                 "corr": corr,
+                "market_stress": market_stress,
             },
         }
 
+    def _due(self, name: str, cached, t: int, step: int) -> bool:
+        """
+        Refresh decision for one heavy metric
+        """
+        if self.scheduler is None:
+            return cached is None or t % step == 0
+
+        due = cached is None or self.scheduler.due(name, t)
+        if due:
+            self.scheduler.mark(name, t)
+        return due
+
     # ====================================================
     # SCORE HELPERS
     # ====================================================
@@ -177,14 +313,24 @@ class RegimeClassifier:
         return 0.5 * hl_score + 0.5 * hurst_score
 
     @staticmethod
-    def _shock_score(spread: pd.Series) -> float:
-        mu = spread.mean()
-        sigma = spread.std()
+    def _shock_score(spread: pd.Series, t: int, window: int) -> float:
+        """
+        exp(-|z|) of the last bar of spread[t - window : t]
+        against that window
+        """
+        moments = shared_moments(spread)
+        if moments is None:
+            s_w = spread.iloc[t - window : t]
+            mu, sigma, last = s_w.mean(), s_w.std(), s_w.iloc[-1]
+        else:
+            mu = moments.mean(window, min_periods=1)[t - 1]
+            sigma = moments.std(window, min_periods=1)[t - 1]
+            last = moments.values[t - 1]
 
         if sigma == 0:
             return 0.0
 
-        z = (spread.iloc[-1] - mu) / sigma
+        z = (last - mu) / sigma
         return float(np.exp(-abs(z)))
 
     # ====================================================
@@ -196,6 +342,31 @@ class RegimeClassifier:
         return cls.POSITION_MULTIPLIER.get(regime, 0.0)
 
 
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> dict:
+        return {
+            "adf_p": self._adf_p,
+            "coint_p": self._coint_p,
+            "hurst": self._hurst,
+            "last_regime": self.last_regime,
+            "scheduler": (
+                None if self.scheduler is None
+                else self.scheduler.get_state()
+            ),
+        }
+
+    def set_state(self, state: dict):
+        self._adf_p = state["adf_p"]
+        self._coint_p = state["coint_p"]
+        self._hurst = state["hurst"]
+        self.last_regime = state["last_regime"]
+
+        if self.scheduler is not None and state.get("scheduler"):
+            self.scheduler.set_state(state["scheduler"])
+
     # ====================================================
     # WALK-FORWARD ADAPTER
     # ====================================================
@@ -206,14 +377,41 @@ class RegimeClassifier:
         x,
         y,
         spread,
+        beta=None,
+        legs: tuple | None = None,
+        market_stress: pd.Series | None = None,
+        RollingCorrelation: dict | None = None,
         **_
     ):
         """
         Walk-forward compatible interface
+
+        With `legs=(x_col, y_col)` in data and the `correlation`
+        engine (window = CORR_WINDOW) in the module list, coupling
+        reads the shared universe correlation.
+
+        `market_stress` in data: series position-aligned with the
+        pair (MarketStress.align), loaded once per run.
         """
+        corr = None
+        engine = self.correlation
+        if (
+            RollingCorrelation is not None
+            and engine is not None
+            and legs is not None
+            and engine.ready
+        ):
+            corr = engine.pair_corr(*legs)
+
         return self.evaluate(
             t=t,
             x=x,
             y=y,
-            spread=spread
+            spread=spread,
+            beta=beta,
+            corr=corr,
+            market_stress=(
+                None if market_stress is None
+                else float(market_stress.iloc[t])
+            ),
         )
\ No newline at end of file
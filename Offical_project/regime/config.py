@@ -21,3 +21,17 @@ class RegimeConfig:
 
     HL_MIN: int = 2
     HL_MAX: int = 80
+
+    # adaptive heavy-stat scheduling (regime/scheduler.py)
+    STALENESS_MULT: int = 4
+    HEAVY_MIN_GAP: int = 5
+
+    CUSUM_K: float = 0.5
+    CUSUM_H: float = 5.0
+    BETA_JUMP_Z: float = 4.0
+    VAR_SHORT_WINDOW: int = 20
+    VAR_RATIO_MAX: float = 2.5
+
+    # market-factor throttle (regime/market.py)
+    MARKET_THROTTLE: float = 0.5
+    MARKET_STRESS_CUTOFF: float = 0.8
@@ -0,0 +1,94 @@
+# regime/market.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from data.data_loader import load_investing_csv
+
+
+class MarketStress:
+    """
+    Market-factor stress score from an index (e.g. VNI)
+
+    score in [0, 1]:
+        0.5 * drawdown from rolling peak / DD_MAX
+      + 0.5 * (short vol / long vol - 1) / (VOL_RATIO_MAX - 1)
+
+    Shifted by one bar → value at t only uses closes < t.
+    """
+
+    def __init__(
+        self,
+        dd_window: int = 60,
+        vol_short: int = 20,
+        vol_long: int = 250,
+        dd_max: float = 0.20,
+        vol_ratio_max: float = 2.0,
+    ):
+        self.dd_window = dd_window
+        self.vol_short = vol_short
+        self.vol_long = vol_long
+        self.dd_max = dd_max
+        self.vol_ratio_max = vol_ratio_max
+
+    def score(self, close: pd.Series) -> pd.Series:
+        ret = np.log(close).diff()
+
+        peak = close.rolling(self.dd_window, min_periods=1).max()
+        dd = 1.0 - close / peak
+        dd_score = np.clip(dd / self.dd_max, 0.0, 1.0)
+
+        vol_ratio = (
+            ret.rolling(self.vol_short).std()
+            / ret.rolling(self.vol_long, min_periods=self.vol_short).std()
+        )
+        vol_score = np.clip(
+            (vol_ratio - 1.0) / (self.vol_ratio_max - 1.0), 0.0, 1.0
+        )
+
+        stress = 0.5 * dd_score + 0.5 * vol_score.fillna(0.0)
+        return stress.shift(1).rename("market_stress")
+
+    @staticmethod
+    def align(stress: pd.Series, dates: pd.Index) -> pd.Series:
+        """
+        Reindex a stress series onto a pair's dates (calendar
+        day match, forward-filled; position-aligned with the pair)
+        """
+        target = pd.to_datetime(dates, utc=True)
+        target = target.tz_localize(None).normalize()
+
+        src = stress.copy()
+        src.index = pd.to_datetime(src.index).normalize()
+        src = src[~src.index.duplicated(keep="last")].sort_index()
+
+        aligned = src.reindex(src.index.union(target)).ffill()
+        return pd.Series(
+            aligned.reindex(target).to_numpy(),
+            index=dates,
+            name="market_stress",
+        )
+
+    @staticmethod
+    def throttle(stress: float, strength: float, cutoff: float) -> float:
+        """
+        Multiplier on position size: 1 → no stress,
+        0 once stress >= cutoff
+        """
+        if stress is None or np.isnan(stress):
+            return 1.0
+        if stress >= cutoff:
+            return 0.0
+        return float(np.clip(1.0 - strength * stress, 0.0, 1.0))
+
+
+@lru_cache(maxsize=8)
+def load_market_stress(path: str) -> pd.Series:
+    """
+    Parse + score an Investing.com index file once per process;
+    every pair in the run reuses the same series
+    """
+    index = load_investing_csv(path)
+    return MarketStress().score(index["close"])
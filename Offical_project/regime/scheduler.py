@@ -0,0 +1,231 @@
+# regime/scheduler.py
+
+import numpy as np
+import pandas as pd
+
+from regime.config import RegimeConfig
+
+
+HEAVY_STATS = ("adf", "coint", "hurst")
+
+# detector → heavy stats it can invalidate
+#   beta jump            → hedge relation   → coint
+#   CUSUM / variance     → spread dynamics  → adf, hurst
+TRIGGER_STATS = {
+    "beta": ("coint",),
+    "cusum": ("adf", "hurst"),
+    "variance": ("adf", "hurst"),
+}
+
+
+class AdaptiveScheduler:
+    """
+    Change-detection driven refresh of heavy regime statistics
+
+    Replaces the fixed `t % STEP` clocks in RegimeClassifier:
+
+    - Cheap per-bar detectors
+        * two-sided CUSUM on standardized spread residuals
+          (Δspread: ~white noise while the regime holds)
+        * Kalman beta jump (|Δbeta| vs its rolling std)
+        * short / long variance ratio of Δspread leaving its band
+    - A detector firing marks only its stats stale
+      (TRIGGER_STATS); per-stat cooldown max(STEP,
+      HEAVY_MIN_GAP) between triggered refreshes
+    - Fallback: recompute once a stat is older than
+      STEP * STALENESS_MULT bars
+    - Counts evaluations against the fixed schedule
+    """
+
+    def __init__(self, config: RegimeConfig | None = None):
+        self.config = config or RegimeConfig()
+
+        c = self.config
+        self.steps = {
+            "adf": c.ADF_STEP,
+            "coint": c.COINT_STEP,
+            "hurst": c.HURST_STEP,
+        }
+        # a trigger never refreshes a stat faster than its clock
+        self.cooldown = {
+            name: max(step, c.HEAVY_MIN_GAP)
+            for name, step in self.steps.items()
+        }
+        self.max_staleness = {
+            name: step * c.STALENESS_MULT
+            for name, step in self.steps.items()
+        }
+
+        # detector state
+        self._g_pos = 0.0
+        self._g_neg = 0.0
+        self._var_out = False
+        self._last_trigger = {name: None for name in HEAVY_STATS}
+
+        # scheduling state
+        self._last = {name: None for name in HEAVY_STATS}
+        self._pending = {name: False for name in HEAVY_STATS}
+
+        # accounting
+        self.adaptive_count = {name: 0 for name in HEAVY_STATS}
+        self.fixed_count = {name: 0 for name in HEAVY_STATS}
+        self.triggers = {"cusum": 0, "beta": 0, "variance": 0}
+
+    # ====================================================
+    # DETECTORS
+    # ====================================================
+
+    def observe(
+        self,
+        t: int,
+        spread_w: pd.Series,
+        beta_w: pd.Series | None = None,
+    ) -> bool:
+        """
+        Update detectors with window data (< t).
+        Returns True if a heavy stat was marked stale at t.
+        """
+        c = self.config
+        fired = []
+
+        # ---------- fixed-schedule reference ----------
+        for name, step in self.steps.items():
+            if self._last[name] is None or t % step == 0:
+                self.fixed_count[name] += 1
+
+        ds = np.diff(spread_w.to_numpy(dtype=float))
+        ds = ds[np.isfinite(ds)]
+        if len(ds) < 3:
+            return False
+
+        mu = ds[:-1].mean()
+        sigma = ds[:-1].std(ddof=1)
+
+        # ---------- CUSUM on spread residual ----------
+        if sigma > 0:
+            z = (ds[-1] - mu) / sigma
+            self._g_pos = max(0.0, self._g_pos + z - c.CUSUM_K)
+            self._g_neg = max(0.0, self._g_neg - z - c.CUSUM_K)
+
+            if max(self._g_pos, self._g_neg) > c.CUSUM_H:
+                fired.append("cusum")
+                self._g_pos = self._g_neg = 0.0
+
+        # ---------- Kalman beta jump ----------
+        if beta_w is not None:
+            db = np.diff(beta_w.to_numpy(dtype=float))
+            db = db[np.isfinite(db)]
+            if len(db) > 2:
+                scale = np.std(db[:-1], ddof=1)
+                if scale > 0 and abs(db[-1]) > c.BETA_JUMP_Z * scale:
+                    fired.append("beta")
+
+        # ---------- variance ratio (edge-triggered) ----------
+        short = ds[-c.VAR_SHORT_WINDOW:]
+        if sigma > 0 and len(short) > 1:
+            ratio = np.var(short, ddof=1) / sigma ** 2
+            out = not (1.0 / c.VAR_RATIO_MAX <= ratio <= c.VAR_RATIO_MAX)
+            if out and not self._var_out:
+                fired.append("variance")
+            self._var_out = out
+
+        if not fired:
+            return False
+
+        stale = set()
+        for kind in fired:
+            self.triggers[kind] += 1
+            stale.update(TRIGGER_STATS[kind])
+
+        marked = False
+        for name in stale:
+            last = self._last_trigger[name]
+            if last is not None and t - last < self.cooldown[name]:
+                continue
+            self._last_trigger[name] = t
+            self._pending[name] = True
+            marked = True
+        return marked
+
+    # ====================================================
+    # SCHEDULING
+    # ====================================================
+
+    def due(self, name: str, t: int) -> bool:
+        """
+        Should heavy stat `name` be recomputed at t?
+        """
+        last = self._last[name]
+        if last is None or self._pending[name]:
+            return True
+        return t - last >= self.max_staleness[name]
+
+    def mark(self, name: str, t: int):
+        """
+        Record a heavy recompute of `name` at t
+        """
+        self._last[name] = t
+        self._pending[name] = False
+        self.adaptive_count[name] += 1
+
+    # ====================================================
+    # REPORT
+    # ====================================================
+
+    def report(self) -> dict:
+        """
+        Heavy evaluations: adaptive vs fixed `t % STEP` schedule
+        """
+        out = {}
+        for name in HEAVY_STATS:
+            fixed = self.fixed_count[name]
+            adaptive = self.adaptive_count[name]
+            out[name] = {
+                "fixed": fixed,
+                "adaptive": adaptive,
+                "saved": fixed - adaptive,
+                "ratio": fixed / adaptive if adaptive else np.inf,
+            }
+
+        fixed = sum(self.fixed_count.values())
+        adaptive = sum(self.adaptive_count.values())
+        out["total"] = {
+            "fixed": fixed,
+            "adaptive": adaptive,
+            "saved": fixed - adaptive,
+            "ratio": fixed / adaptive if adaptive else np.inf,
+        }
+        out["triggers"] = dict(self.triggers)
+        return out
+
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> dict:
+        return {
+            "g_pos": self._g_pos,
+            "g_neg": self._g_neg,
+            "var_out": self._var_out,
+            "last_trigger": dict(self._last_trigger),
+            "last": dict(self._last),
+            "pending": dict(self._pending),
+            "adaptive_count": dict(self.adaptive_count),
+            "fixed_count": dict(self.fixed_count),
+            "triggers": dict(self.triggers),
+        }
+
+    def set_state(self, state: dict):
+        self._g_pos = state["g_pos"]
+        self._g_neg = state["g_neg"]
+        self._var_out = state["var_out"]
+        last = state["last_trigger"]
+        if not isinstance(last, dict):
+            # checkpoints from before per-stat cooldowns
+            last = {name: last for name in HEAVY_STATS}
+        self._last_trigger = dict(last)
+        self._last = dict(state["last"])
+        self._pending = dict(state["pending"])
+        self.adaptive_count = dict(state["adaptive_count"])
+        self.fixed_count = dict(state["fixed_count"])
+        self.triggers = dict(state["triggers"])
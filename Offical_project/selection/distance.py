@@ -0,0 +1,147 @@
+# selection/distance.py
+
+import numpy as np
+import pandas as pd
+
+
+class DistanceIndex:
+    """
+    Distance-method candidate generation (Gatev et al.)
+
+    SSD between normalized price paths for every pair via
+
+        ||a - b||² = ||a||² + ||b||² - 2 a·b
+
+    - a·b for a block of tickers against the whole panel
+      is one matrix product (BLAS)
+    - Blocks are sized to stay under `max_block_bytes`
+    - Only each ticker's top-k nearest partners are kept
+      → O(N·k) output instead of O(N²)
+
+    normalize:
+        "start"  : P / P[0]            (price levels)
+        "zscore" : (P - mean) / std    (works on log prices too)
+    """
+
+    def __init__(
+        self,
+        normalize: str = "start",
+        max_block_bytes: int = 64 * 2**20,
+    ):
+        if normalize not in ("start", "zscore"):
+            raise ValueError("normalize must be 'start' or 'zscore'")
+
+        self.normalize = normalize
+        self.max_block_bytes = max_block_bytes
+
+        self.columns: list = []
+        self._paths = None   # T x N normalized
+        self._sq = None      # ||column||²
+
+    # ====================================================
+    # FIT
+    # ====================================================
+
+    def fit(self, panel: pd.DataFrame) -> "DistanceIndex":
+        """
+        Normalize a price panel (rows = bars, columns = tickers).
+        Columns with any NaN are left out.
+        """
+        panel = panel.loc[:, panel.notna().all()]
+        P = panel.to_numpy(dtype=float)
+
+        if self.normalize == "start":
+            Z = P / P[0]
+        else:
+            sd = P.std(axis=0, ddof=1)
+            sd[sd == 0] = np.nan
+            Z = (P - P.mean(axis=0)) / sd
+
+        keep = np.isfinite(Z).all(axis=0)
+        self.columns = list(panel.columns[keep])
+        self._paths = np.ascontiguousarray(Z[:, keep])
+        self._sq = np.einsum("ij,ij->j", self._paths, self._paths)
+        return self
+
+    @property
+    def block_size(self) -> int:
+        """
+        Tickers per block: block x N float64 distance matrix
+        (plus the product temporary) under max_block_bytes
+        """
+        n = max(len(self.columns), 1)
+        return int(max(1, self.max_block_bytes // (16 * n)))
+
+    # ====================================================
+    # QUERIES
+    # ====================================================
+
+    def blocks(self):
+        """
+        Yield (i0, i1, D) with D[r, j] = SSD(ticker i0 + r, ticker j)
+        """
+        Z, sq = self._paths, self._sq
+        n = len(self.columns)
+
+        for i0 in range(0, n, self.block_size):
+            i1 = min(i0 + self.block_size, n)
+            D = sq[i0:i1, None] + sq[None, :] - 2.0 * (Z[:, i0:i1].T @ Z)
+            np.maximum(D, 0.0, out=D)
+            D[np.arange(i1 - i0), np.arange(i0, i1)] = np.inf
+            yield i0, i1, D
+
+    def nearest(self, k: int = 5) -> pd.DataFrame:
+        """
+        Each ticker's k nearest partners:
+        columns ticker, partner, ssd, rank (1 = closest)
+        """
+        n = len(self.columns)
+        k = min(k, n - 1)
+        if k <= 0:
+            return pd.DataFrame(columns=["ticker", "partner", "ssd", "rank"])
+
+        idx = np.empty((n, k), dtype=np.int64)
+        ssd = np.empty((n, k))
+
+        for i0, i1, D in self.blocks():
+            part = np.argpartition(D, k - 1, axis=1)[:, :k]
+            vals = np.take_along_axis(D, part, axis=1)
+            order = np.argsort(vals, axis=1, kind="stable")
+            idx[i0:i1] = np.take_along_axis(part, order, axis=1)
+            ssd[i0:i1] = np.take_along_axis(vals, order, axis=1)
+
+        cols = np.asarray(self.columns, dtype=object)
+        return pd.DataFrame({
+            "ticker": np.repeat(cols, k),
+            "partner": cols[idx.ravel()],
+            "ssd": ssd.ravel(),
+            "rank": np.tile(np.arange(1, k + 1), n),
+        })
+
+    def candidates(self, k: int = 5, limit: int | None = None) -> list:
+        """
+        Unique (a, b) pairs from the k-nearest lists,
+        smallest SSD first (a precedes b in panel order)
+        """
+        nn = self.nearest(k)
+        if nn.empty:
+            return []
+
+        pos = {c: i for i, c in enumerate(self.columns)}
+        first = nn["ticker"].map(pos) < nn["partner"].map(pos)
+        a = nn["ticker"].where(first, nn["partner"])
+        b = nn["partner"].where(first, nn["ticker"])
+
+        pairs = (
+            pd.DataFrame({"a": a, "b": b, "ssd": nn["ssd"]})
+            .drop_duplicates(["a", "b"])
+            .sort_values("ssd", kind="stable")
+        )
+        if limit is not None:
+            pairs = pairs.head(limit)
+        return list(zip(pairs["a"], pairs["b"]))
+
+    def ssd(self, a: str, b: str) -> float:
+        i, j = self.columns.index(a), self.columns.index(b)
+        d = self._paths[:, i] - self._paths[:, j]
+        return float(d @ d)
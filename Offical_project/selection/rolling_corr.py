@@ -0,0 +1,227 @@
+# selection/rolling_corr.py
+
+import numpy as np
+import pandas as pd
+
+
+class RollingCorrelation:
+    """
+    Incrementally updated rolling covariance / correlation
+    over a whole price (or return) panel
+
+    - update(row): add newest bar, drop expired bar → O(N²)
+    - Keeps running sums and cross-products of the window
+      (shifted by the first row to limit cancellation)
+    - Full re-sum every `refresh_every` updates bounds drift
+    - Any pair's correlation on demand: pair_corr(a, b)
+
+    Walk-forward safe: step(t) adds bar t - 1, so the window
+    at t matches RegimeClassifier's [t - W, t) slices.
+    """
+
+    # walk-forward graph: no module inputs
+    inputs = ()
+
+    def __init__(
+        self,
+        window: int,
+        columns: list,
+        refresh_every: int = 1000,
+    ):
+        if window < 2:
+            raise ValueError("window must be >= 2")
+
+        self.window = window
+        self.columns = list(columns)
+        self.refresh_every = refresh_every
+
+        self._pos = {c: i for i, c in enumerate(self.columns)}
+        n = len(self.columns)
+
+        self._buf = np.zeros((window, n))
+        self._shift = None
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+
+        self.count = 0       # bars currently in window
+        self.n_updates = 0   # bars seen in total
+
+    # ====================================================
+    # UPDATE
+    # ====================================================
+
+    def update(self, row):
+        """
+        Add one bar (array-like aligned with `columns`)
+        """
+        r = np.asarray(row, dtype=float)
+        if r.shape != self._sum.shape:
+            raise ValueError(
+                f"Row has {r.size} values, expected {len(self.columns)}"
+            )
+        if not np.all(np.isfinite(r)):
+            raise ValueError("Row contains NaN / inf; dropna the panel first")
+
+        if self._shift is None:
+            self._shift = r.copy()
+        r = r - self._shift
+
+        slot = self.n_updates % self.window
+
+        if self.count == self.window:
+            old = self._buf[slot]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        else:
+            self.count += 1
+
+        self._buf[slot] = r
+        self._sum += r
+        self._cross += np.outer(r, r)
+        self.n_updates += 1
+
+        if self.refresh_every and self.n_updates % self.refresh_every == 0:
+            self._refresh()
+
+    def _refresh(self):
+        """
+        Exact re-sum of the current window
+        """
+        w = self._window_rows()
+        self._sum = w.sum(axis=0)
+        self._cross = w.T @ w
+
+    def _window_rows(self) -> np.ndarray:
+        if self.count < self.window:
+            return self._buf[: self.count]
+        return self._buf
+
+    # ====================================================
+    # QUERIES
+    # ====================================================
+
+    @property
+    def ready(self) -> bool:
+        return self.count == self.window
+
+    def cov(self, ddof: int = 1) -> pd.DataFrame:
+        return pd.DataFrame(
+            self._cov(ddof), index=self.columns, columns=self.columns
+        )
+
+    def corr(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self._corr(), index=self.columns, columns=self.columns
+        )
+
+    def pair_corr(self, a: str, b: str) -> float:
+        """
+        Correlation of one pair from the running sums → O(1)
+        """
+        i, j = self._pos[a], self._pos[b]
+        n = self.count
+        if n < 2:
+            return np.nan
+
+        si, sj = self._sum[i], self._sum[j]
+        cij = self._cross[i, j] - si * sj / n
+        cii = self._cross[i, i] - si * si / n
+        cjj = self._cross[j, j] - sj * sj / n
+
+        denom = np.sqrt(cii * cjj)
+        if denom <= 0:
+            return np.nan
+        return float(np.clip(cij / denom, -1.0, 1.0))
+
+    def pairs(self, min_abs: float = 0.0) -> pd.DataFrame:
+        """
+        Every pair (upper triangle) with |corr| >= min_abs,
+        sorted by |corr| descending
+        """
+        c = self._corr()
+        i, j = np.triu_indices(len(self.columns), k=1)
+        vals = c[i, j]
+
+        keep = np.abs(vals) >= min_abs
+        cols = np.asarray(self.columns, dtype=object)
+        df = pd.DataFrame({
+            "a": cols[i[keep]],
+            "b": cols[j[keep]],
+            "corr": vals[keep],
+        })
+        return df.reindex(
+            df["corr"].abs().sort_values(ascending=False).index
+        ).reset_index(drop=True)
+
+    def _cov(self, ddof: int) -> np.ndarray:
+        n = self.count
+        if n - ddof <= 0:
+            return np.full(self._cross.shape, np.nan)
+        return (
+            self._cross - np.outer(self._sum, self._sum) / n
+        ) / (n - ddof)
+
+    def _corr(self) -> np.ndarray:
+        cov = self._cov(ddof=1)
+        sd = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = cov / np.outer(sd, sd)
+        return np.clip(c, -1.0, 1.0)
+
+    # ====================================================
+    # BATCH / WALK-FORWARD
+    # ====================================================
+
+    @classmethod
+    def from_panel(
+        cls,
+        panel: pd.DataFrame,
+        window: int,
+        **kwargs,
+    ) -> "RollingCorrelation":
+        """
+        Engine warmed up on the last `window` rows of a panel
+        (load_universe / load_panel_csv output)
+        """
+        eng = cls(window, panel.columns, **kwargs)
+        for row in panel.to_numpy(dtype=float)[-window:]:
+            eng.update(row)
+        return eng
+
+    def step(self, t: int, panel: pd.DataFrame, **_):
+        """
+        Walk-forward adapter: add bar t - 1 (data < t).
+
+        Output is a small per-bar record; consumers hold the
+        module itself (RegimeClassifier(correlation=...)) and
+        query it in the same bar.
+        """
+        if t > 0:
+            self.update(panel.iloc[t - 1].to_numpy(dtype=float))
+
+        return {
+            "t": t,
+            "ready": self.ready,
+        }
+
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> dict:
+        return {
+            "buf": self._buf.copy(),
+            "shift": None if self._shift is None else self._shift.copy(),
+            "sum": self._sum.copy(),
+            "cross": self._cross.copy(),
+            "count": self.count,
+            "n_updates": self.n_updates,
+        }
+
+    def set_state(self, state: dict):
+        self._buf = state["buf"].copy()
+        self._shift = None if state["shift"] is None else state["shift"].copy()
+        self._sum = state["sum"].copy()
+        self._cross = state["cross"].copy()
+        self.count = state["count"]
+        self.n_updates = state["n_updates"]
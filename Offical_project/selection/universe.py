@@ -0,0 +1,394 @@
+# selection/universe.py
+
+import numpy as np
+import pandas as pd
+
+from diagnostics.spread_gate import SpreadGate
+from diagnostics.spread_score import SpreadScore
+from diagnostics.spread_stability import SpreadStability
+from selection.distance import DistanceIndex
+from spread.builder import SpreadBuilder
+from spread.hedge_ratio import HedgeRatio
+from utility.stat_tests import StatTests
+
+
+PREFILTERS = ("corr", "distance")
+
+# kind → (window, step), SpreadStability defaults
+STABILITY_WINDOWS = {
+    "coint": (180, 10),
+    "adf": (90, 5),
+    "hl": (60, 1),
+    "hurst": (100, 1),
+}
+
+
+def pair_label(a: str, b: str) -> str:
+    """
+    "X-Y" key, same convention as BatchJob.pair
+    """
+    return f"{a}-{b}"
+
+
+def pair_key(a: str, b: str) -> tuple:
+    """
+    Orientation-free pair key: ("A", "B") for A-B and B-A
+    """
+    return tuple(sorted((a, b)))
+
+
+def is_active(pair: str, active_legs) -> bool:
+    """
+    "X-Y" label (either orientation) in a set of pair_key
+    tuples; every "-" is tried as the split, so tickers
+    containing "-" (BRK-B) still match
+    """
+    return any(
+        pair_key(pair[:i], pair[i + 1:]) in active_legs
+        for i, c in enumerate(pair) if c == "-"
+    )
+
+
+class UniverseSelector:
+    """
+    Walk-forward pair selection stage
+
+    At each rebalance bar t (every `rebalance_every` bars once
+    `lookback` bars exist) the universe is re-screened on
+    panel rows [t - lookback, t) only:
+
+        1. prefilter, top `max_candidates`:
+           "corr"     → |corr| of the window
+           "distance" → DistanceIndex k-nearest (SSD of
+                        z-scored paths, `neighbours` per ticker)
+        2. SpreadScore.raw_score on the lookback window
+           (static OLS hedge)
+        3. SpreadStability flags over rolling sub-windows
+        4. SpreadGate.is_tradable → ranked by total_score,
+           top `max_pairs` become the active set
+
+    Sub-window statistics sit on a fixed absolute grid
+    (window end % step == 0) and each uses its own OLS hedge,
+    so a value depends only on (pair, kind, end): the next
+    rebalance reuses every window that is still inside the
+    lookback and computes only the new ones.
+
+    Rebalance bars sit on a fixed grid (lookback + k *
+    rebalance_every); between them the set of the latest
+    rebalance at or before t is carried forward. step(t) looks
+    that rebalance up in `history` (computing it on data before
+    it if missing), so its output depends on t only: one
+    selector can be shared by the engines of every pair, run in
+    lockstep or one after another.
+    """
+
+    # walk-forward graph: no module inputs
+    inputs = ()
+
+    def __init__(
+        self,
+        lookback: int = 252,
+        rebalance_every: int = 21,
+        max_candidates: int = 50,
+        min_corr: float = 0.7,
+        prefilter: str = "corr",
+        neighbours: int = 5,
+        max_pairs: int = 10,
+        windows: dict | None = None,
+        hl_min: float = 5,
+        hl_max: float = 120,
+    ):
+        if prefilter not in PREFILTERS:
+            raise ValueError(f"prefilter must be one of {PREFILTERS}")
+
+        self.lookback = lookback
+        self.rebalance_every = rebalance_every
+        self.max_candidates = max_candidates
+        self.min_corr = min_corr
+        self.prefilter = prefilter
+        self.neighbours = neighbours
+        self.max_pairs = max_pairs
+        self.windows = {**STABILITY_WINDOWS, **(windows or {})}
+        self.hl_min = hl_min
+        self.hl_max = hl_max
+
+        self.active: tuple = ()
+        self.scores = pd.DataFrame()
+        self.history: dict = {}   # rebalance t → active pairs
+        self._legs: dict = {}     # rebalance t → pair_key set
+
+        self._cache: dict = {}    # (pair, kind, end) → statistic
+        self._last_t = None
+        self._last_rebalance = None
+
+        # accounting
+        self.computed = 0
+        self.reused = 0
+
+    @property
+    def warmup(self) -> int:
+        return self.lookback
+
+    # ====================================================
+    # WALK-FORWARD STEP
+    # ====================================================
+
+    def step(
+        self,
+        t: int,
+        panel: pd.DataFrame,
+        **_
+    ):
+        """
+        Active pair set at t (data < t)
+        """
+        r = self._rebalance_bar(t)
+        if r is None:
+            active = ()
+        else:
+            if r not in self.history:
+                self.rebalance(r, panel)
+            active = self.history[r]
+
+        self.active = active
+        self._last_t = t
+        return {
+            "t": t,
+            "rebalanced": r == t,
+            "active_pairs": active,
+            "active_legs": self._legs.get(r, frozenset()),
+        }
+
+    def _rebalance_bar(self, t: int) -> int | None:
+        """
+        Latest grid rebalance bar <= t (None before lookback)
+        """
+        if t < self.lookback:
+            return None
+        k = (t - self.lookback) // self.rebalance_every
+        return self.lookback + k * self.rebalance_every
+
+    # ====================================================
+    # SELECTION
+    # ====================================================
+
+    def rebalance(self, t: int, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        Re-screen the universe on rows [t - lookback, t)
+        """
+        start = t - self.lookback
+        window = panel.iloc[start:t]
+        window = window.loc[:, window.notna().all()]
+
+        rows = []
+        legs = {}
+        for a, b in self.candidates(window):
+            x = window[a].reset_index(drop=True)
+            y = window[b].reset_index(drop=True)
+
+            beta = HedgeRatio.ols(x, y)
+            spread = SpreadBuilder.build(x, y, beta)
+
+            raw = SpreadScore.raw_score(x, y, spread)
+            adf_p = 1.0 - raw["adf"]
+
+            pair = pair_label(a, b)
+            legs[pair] = pair_key(a, b)
+            stab = self._stability(pair, x, y, start, t)
+
+            rows.append({
+                "pair": pair,
+                "x": a,
+                "y": b,
+                "beta": beta,
+                "adf_p": adf_p,
+                **raw,
+                **stab,
+                "tradable": SpreadGate.is_tradable(
+                    adf_p,
+                    raw["half_life_raw"],
+                    raw["hurst_raw"],
+                    stab["stab_score"],
+                    hl_min=self.hl_min,
+                    hl_max=self.hl_max,
+                ),
+            })
+
+        scores = pd.DataFrame(rows)
+        if not scores.empty:
+            scores = scores.sort_values(
+                "total_score", ascending=False
+            ).reset_index(drop=True)
+            active = scores.loc[scores["tradable"], "pair"]
+            self.active = tuple(active.iloc[: self.max_pairs])
+        else:
+            self.active = ()
+
+        self.scores = scores
+        self.history[t] = self.active
+        self._legs[t] = frozenset(legs[p] for p in self.active)
+        self._last_rebalance = t
+        self._prune(start)
+        return scores
+
+    def candidates(self, window: pd.DataFrame) -> list:
+        """
+        Candidate (x, y) pairs of the window, best first
+        """
+        cols = list(window.columns)
+        if len(cols) < 2:
+            return []
+
+        if self.prefilter == "distance":
+            # panel may hold log prices → z-score the paths
+            index = DistanceIndex(normalize="zscore").fit(window)
+            return index.candidates(self.neighbours, self.max_candidates)
+
+        c = np.corrcoef(window.to_numpy(dtype=float), rowvar=False)
+        i, j = np.triu_indices(len(cols), k=1)
+        vals = np.abs(c[i, j])
+
+        keep = np.flatnonzero(np.nan_to_num(vals) >= self.min_corr)
+        keep = keep[np.argsort(-vals[keep], kind="stable")]
+        keep = keep[: self.max_candidates]
+
+        return [(cols[i[k]], cols[j[k]]) for k in keep]
+
+    # ====================================================
+    # CACHED STABILITY
+    # ====================================================
+
+    def _stability(self, pair, x, y, start: int, t: int) -> dict:
+        """
+        SpreadStability-style flag fractions from cached
+        sub-window statistics (absolute window ends in (start, t])
+        """
+        xv = x.to_numpy(dtype=float)
+        yv = y.to_numpy(dtype=float)
+
+        flags = {}
+        for kind, (window, step) in self.windows.items():
+            first = start + window
+            first += (-first) % step
+            ends = list(range(first, t + 1, step))
+
+            todo = [e for e in ends if (pair, kind, e) not in self._cache]
+            self.reused += len(ends) - len(todo)
+            if todo:
+                values = self._window_stats(
+                    kind, xv, yv, np.asarray(todo) - start, window
+                )
+                for end, value in zip(todo, values):
+                    self._cache[(pair, kind, end)] = value
+                self.computed += len(todo)
+
+            hits = [
+                self._flag(kind, self._cache[(pair, kind, e)]) for e in ends
+            ]
+            flags[f"{kind}_stab"] = float(np.mean(hits)) if hits else 0.0
+
+        return SpreadStability.combine(flags)
+
+    @staticmethod
+    def _window_stats(kind, x, y, ends, window) -> np.ndarray:
+        """
+        One statistic per window [end - window, end).
+
+        Hedge, half-life and Hurst are evaluated for all new
+        windows at once (closed-form OLS per row, same estimators
+        as HedgeRatio.ols / TimeSeriesStats); ADF and coint go
+        through StatTests.
+        """
+        rows = ends[:, None] - window + np.arange(window)
+        X, Y = x[rows], y[rows]
+
+        if kind == "coint":
+            return np.array([
+                StatTests.cointegration_test(xw, yw)["p_value"]
+                for xw, yw in zip(X, Y)
+            ])
+
+        # x = beta * y + e, no intercept
+        beta = (X * Y).sum(axis=1) / (Y * Y).sum(axis=1)
+        S = X - beta[:, None] * Y
+
+        if kind == "adf":
+            return np.array([
+                StatTests.adf_test(pd.Series(s))["p_value"] for s in S
+            ])
+        if kind == "hl":
+            return UniverseSelector._batch_half_life(S)
+        return UniverseSelector._batch_hurst(S)
+
+    @staticmethod
+    def _batch_half_life(S: np.ndarray) -> np.ndarray:
+        """
+        Row-wise TimeSeriesStats.half_life
+        """
+        lag = S[:, :-1]
+        ret = np.diff(S, axis=1)
+
+        lag_c = lag - lag.mean(axis=1, keepdims=True)
+        ret_c = ret - ret.mean(axis=1, keepdims=True)
+        slope = (lag_c * ret_c).sum(axis=1) / (lag_c ** 2).sum(axis=1)
+
+        with np.errstate(divide="ignore"):
+            return np.where(slope < 0, -np.log(2) / slope, np.inf)
+
+    @staticmethod
+    def _batch_hurst(S: np.ndarray, max_lag: int = 20) -> np.ndarray:
+        """
+        Row-wise TimeSeriesStats.hurst_exponent
+        """
+        lags = np.arange(2, max_lag)
+        with np.errstate(divide="ignore"):
+            log_tau = np.column_stack([
+                np.log(np.sqrt(np.std(S[:, lag:] - S[:, :-lag], axis=1, ddof=1)))
+                for lag in lags
+            ])
+
+        u = np.log(lags) - np.log(lags).mean()
+        log_tau = log_tau - log_tau.mean(axis=1, keepdims=True)
+        return 2 * (log_tau @ u) / (u @ u)
+
+    @staticmethod
+    def _flag(kind: str, value: float) -> bool:
+        # thresholds as in SpreadStability.rolling_*
+        if kind in ("coint", "adf"):
+            return value < 0.05
+        if kind == "hl":
+            return 2 <= value <= 80
+        return value < 0.5
+
+    def _prune(self, start: int):
+        """
+        Drop windows that can no longer fall inside a lookback
+        """
+        self._cache = {
+            key: value for key, value in self._cache.items()
+            if key[2] - self.windows[key[1]][0] >= start
+        }
+
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> dict:
+        return {
+            "active": self.active,
+            "scores": self.scores.copy(),
+            "history": dict(self.history),
+            "legs": dict(self._legs),
+            "cache": dict(self._cache),
+            "last_t": self._last_t,
+            "last_rebalance": self._last_rebalance,
+        }
+
+    def set_state(self, state: dict):
+        self.active = tuple(state["active"])
+        self.scores = state["scores"].copy()
+        self.history = dict(state["history"])
+        self._legs = dict(state.get("legs", {}))
+        self._cache = dict(state["cache"])
+        self._last_t = state["last_t"]
+        self._last_rebalance = state["last_rebalance"]
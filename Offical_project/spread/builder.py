@@ -2,6 +2,8 @@
 
 import pandas as pd
 
+from utility.rolling_moments import shared_moments
+
 
 class SpreadBuilder:
     """
@@ -30,7 +32,45 @@ class SpreadBuilder:
     ) -> pd.Series:
         """
         Z-score normalized spread
+        (shared RollingMoments for a pd.Series)
+        """
+        m = shared_moments(spread)
+        if m is None:
+            mean = spread.rolling(window).mean()
+            std = spread.rolling(window).std()
+            return (spread - mean) / std
+        return m.series(m.zscore(window), name=spread.name)
+
+    @staticmethod
+    def basket(
+        prices: pd.DataFrame,
+        weights: pd.DataFrame,
+        chain: bool = True
+    ) -> pd.Series:
+        """
+        N-leg spread = sum_i w_i * P_i
+
+        weights:
+            rows = rebalance dates (e.g. RollingJohansen.fit),
+            each row held from its date until the next
+
+        chain:
+            True → increments use the weights held over the bar,
+            s_t = s_{t-1} + w_{t-1} · (P_t - P_{t-1}), so the
+            series has no jump at a rebalance and
+            spread.diff() is the basket PnL per unit
         """
-        mean = spread.rolling(window).mean()
-        std = spread.rolling(window).std()
-        return (spread - mean) / std
+        w = weights.reindex(prices.index).ffill()[prices.columns]
+        level = (w * prices).sum(axis=1, min_count=prices.shape[1])
+
+        if not chain or level.isna().all():
+            return level.rename("spread")
+
+        first = level.notna().to_numpy().argmax()
+
+        inc = (w.shift(1) * prices.diff()).sum(axis=1)
+        inc.iloc[: first + 1] = 0.0
+
+        spread = level.iloc[first] + inc.cumsum()
+        spread.iloc[:first] = float("nan")
+        return spread.rename("spread")
@@ -3,6 +3,8 @@
 import pandas as pd
 import numpy as np
 
+from utility.rolling_moments import RollingMoments
+
 
 class SpreadDiagnostics:
     """
@@ -46,3 +48,91 @@ class SpreadDiagnostics:
     	Measure beta smoothness
     	"""
     	return beta.diff().std()
+
+    # ====================================================
+    # ROLLING PANEL (ONE PASS)
+    # ====================================================
+
+    @staticmethod
+    def rolling_panel(
+        spread: pd.Series,
+        window: int = 60,
+        beta: pd.Series | None = None,
+        z_threshold: float = 3.0,
+    ) -> pd.DataFrame:
+        """
+        Rolling versions of summary / spike_ratio / beta_stability
+
+        Moments per window from RollingMoments (pairwise-merged
+        blocks, each centred on its own mean: no cancellation on
+        trending or level-shifted spreads); counts from
+        cumulative sums of indicators.
+
+        - mean, std, skew, kurt : pandas conventions
+          (ddof=1, adjusted skew, excess kurtosis); NaN on
+          constant windows
+        - zero_crossing_rate    : sign changes within the window
+        - spike_ratio           : share of bars whose z vs the
+                                  trailing window exceeds z_threshold
+        - beta_diff_vol         : rolling std of beta.diff()
+        """
+        x = spread.to_numpy(dtype=float)
+        x = np.where(np.isfinite(x), x, np.nan)
+        moments = RollingMoments(x)
+
+        n = moments.count(window)
+        flat = ~(moments.var(window) > 0)
+        mean = moments.mean(window)
+        std = np.where(flat, np.nan, moments.std(window))
+        skew = np.where(flat, np.nan, moments.skew(window))
+        kurt = np.where(flat, np.nan, moments.kurt(window))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # zero crossings: x[t-1] * x[t] < 0
+            prev = np.concatenate(([np.nan], x[:-1]))
+            cross = np.nan_to_num(prev * x) < 0
+            zcr = SpreadDiagnostics._window_sum(
+                cross.astype(float), window
+            ) / n
+
+            # spikes vs trailing window stats (known at t - 1)
+            z = (x[1:] - mean[:-1]) / std[:-1]
+            spike = np.concatenate(
+                ([False], np.nan_to_num(np.abs(z)) > z_threshold)
+            )
+            spike_ratio = SpreadDiagnostics._window_sum(
+                spike.astype(float), window
+            ) / n
+
+        full = n >= window
+        out = pd.DataFrame(
+            {
+                "mean": mean,
+                "std": std,
+                "skew": skew,
+                "kurt": kurt,
+                "zero_crossing_rate": zcr,
+                "spike_ratio": spike_ratio,
+            },
+            index=spread.index,
+        )
+        out[~full] = np.nan
+
+        if beta is not None:
+            db = beta.diff().to_numpy(dtype=float)
+            db = np.where(np.isfinite(db), db, np.nan)
+            out["beta_diff_vol"] = RollingMoments(db).std(
+                window, min_periods=window - 1
+            )
+
+        return out
+
+    @staticmethod
+    def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+        """
+        Trailing window sums from one cumulative sum
+        """
+        c = np.concatenate(([0.0], np.cumsum(values)))
+        out = c[window:] - c[:-window]
+        head = c[1:window]  # partial windows at the start
+        return np.concatenate((head, out))
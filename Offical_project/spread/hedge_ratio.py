@@ -2,7 +2,6 @@
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
 
 
 class HedgeRatio:
@@ -16,9 +15,10 @@ class HedgeRatio:
         Static OLS hedge ratio
         x = beta * y + e
         """
-        model = LinearRegression(fit_intercept=False)
-        model.fit(y.values.reshape(-1, 1), x.values)
-        return float(model.coef_[0])
+        beta = np.linalg.lstsq(
+            y.values.reshape(-1, 1), x.values, rcond=None
+        )[0]
+        return float(beta[0])
 
     @staticmethod
     def rolling_ols(
@@ -0,0 +1,275 @@
+# spread/johansen.py
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from spread.builder import SpreadBuilder
+
+
+# ==================================================
+# BATCHED JOHANSEN
+# ==================================================
+
+def _demean(a: np.ndarray) -> np.ndarray:
+    return a - a.mean(axis=1, keepdims=True)
+
+
+def _resid(y: np.ndarray, z: np.ndarray | None) -> np.ndarray:
+    """
+    Row-batched OLS residual of y (B, T, N) on z (B, T, M)
+    """
+    if z is None:
+        return y
+    zz = np.einsum("btm,btk->bmk", z, z)
+    zy = np.einsum("btm,btn->bmn", z, y)
+    return y - z @ np.linalg.solve(zz, zy)
+
+
+def johansen_batch(windows: np.ndarray, k_ar_diff: int = 1) -> dict:
+    """
+    Johansen trace test (constant term, det_order = 0) for a
+    stack of level windows, all at once.
+
+    Same algebra as statsmodels coint_johansen, with the
+    generalized eigenproblem solved as a batched symmetric one:
+
+        skk = L Lᵀ,  C = L⁻¹ sk0 s00⁻¹ s0k L⁻ᵀ,  eigh(C)
+        vectors = L⁻ᵀ u   (vᵀ skk v = I)
+
+    Parameters
+    ----------
+    windows : (B, T, N) array of prices (log prices)
+    k_ar_diff : lagged differences in the VECM
+
+    Returns
+    -------
+    dict with (B, N) "eig" (descending), (B, N, N) "evec"
+    (columns match eig), (B, N) "trace" statistics and
+    "nobs" (effective sample size)
+    """
+    X = _demean(np.asarray(windows, dtype=float))
+    dx = np.diff(X, axis=1)
+
+    k = k_ar_diff
+    z = None
+    if k > 0:
+        T = dx.shape[1]
+        z = np.concatenate(
+            [dx[:, k - i - 1 : T - i - 1] for i in range(k)], axis=2
+        )
+        z = _demean(z)
+
+    r0 = _resid(_demean(dx[:, k:]), z)
+    rk = _resid(_demean(X[:, 1 : X.shape[1] - k]), z)
+
+    n = rk.shape[1]
+    skk = np.einsum("bti,btj->bij", rk, rk) / n
+    sk0 = np.einsum("bti,btj->bij", rk, r0) / n
+    s00 = np.einsum("bti,btj->bij", r0, r0) / n
+
+    sig = sk0 @ np.linalg.solve(s00, np.swapaxes(sk0, 1, 2))
+
+    L_inv = np.linalg.inv(np.linalg.cholesky(skk))
+    C = L_inv @ sig @ np.swapaxes(L_inv, 1, 2)
+    eig, u = np.linalg.eigh((C + np.swapaxes(C, 1, 2)) / 2)
+
+    eig = eig[:, ::-1]
+    evec = (np.swapaxes(L_inv, 1, 2) @ u)[:, :, ::-1]
+
+    # statsmodels sign convention: evec[0, 0] positive
+    # (other columns are only defined up to sign)
+    evec *= np.sign(evec[:, :1, :1])
+
+    eig = np.clip(eig, 0.0, 1.0 - 1e-12)
+    log1m = np.log1p(-eig)
+    trace = -n * np.cumsum(log1m[:, ::-1], axis=1)[:, ::-1]
+
+    return {"eig": eig, "evec": evec, "trace": trace, "nobs": n}
+
+
+def trace_critical_values(n_legs: int, signif: float = 0.05) -> np.ndarray:
+    """
+    Trace critical values for H0: rank <= r, r = 0 .. n_legs - 1
+    """
+    # imported here: statsmodels is only needed for the tables
+    from statsmodels.tsa.coint_tables import c_sjt
+
+    col = {0.10: 0, 0.05: 1, 0.01: 2}[signif]
+    return np.array([c_sjt(n_legs - r, 0)[col] for r in range(n_legs)])
+
+
+def coint_rank(trace: np.ndarray, crit: np.ndarray) -> np.ndarray:
+    """
+    Sequential trace test: first r whose H0 is not rejected
+    """
+    reject = trace > crit
+    return np.where(
+        reject.all(axis=1), reject.shape[1], np.argmin(reject, axis=1)
+    )
+
+
+# ==================================================
+# ROLLING JOHANSEN
+# ==================================================
+
+class RollingJohansen:
+    """
+    Rolling Johansen weights for one basket
+
+    - Windows [e - window, e) for every rebalance bar
+      e = window, window + step, ... (data < e only)
+    - All windows decomposed in batches of `batch_size`
+    - Weights = leading eigenvector scaled to 1.0 on the
+      first leg (x = first column), applied from bar e on
+    """
+
+    def __init__(
+        self,
+        window: int = 250,
+        step: int = 21,
+        k_ar_diff: int = 1,
+        signif: float = 0.05,
+        batch_size: int = 512,
+    ):
+        self.window = window
+        self.step = step
+        self.k_ar_diff = k_ar_diff
+        self.signif = signif
+        self.batch_size = batch_size
+
+    def fit(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns one row per rebalance bar (index = prices.index[e]):
+        weights per leg, eig1, trace0, rank
+        """
+        P = prices.to_numpy(dtype=float)
+        T, N = P.shape
+
+        ends = np.arange(self.window, T, self.step)
+        if len(ends) == 0:
+            return pd.DataFrame(
+                columns=[*prices.columns, "eig1", "trace0", "rank"]
+            )
+
+        crit = trace_critical_values(N, self.signif)
+        offsets = np.arange(-self.window, 0)
+
+        parts = []
+        for i in range(0, len(ends), self.batch_size):
+            e = ends[i : i + self.batch_size]
+            res = johansen_batch(P[e[:, None] + offsets], self.k_ar_diff)
+
+            lead = res["evec"][:, :, 0]
+            weights = lead / lead[:, :1]
+
+            part = pd.DataFrame(weights, columns=prices.columns)
+            part["eig1"] = res["eig"][:, 0]
+            part["trace0"] = res["trace"][:, 0]
+            part["rank"] = coint_rank(res["trace"], crit)
+            parts.append(part)
+
+        out = pd.concat(parts, ignore_index=True)
+        out.index = prices.index[ends]
+        return out
+
+    def spread(self, prices: pd.DataFrame, chain: bool = True) -> pd.Series:
+        """
+        N-leg spread for ZScoreSignal / SpreadBacktest
+        (NaN before the first rebalance → start the engine
+        at start_index = window + 1)
+        """
+        fit = self.fit(prices)
+        return SpreadBuilder.basket(
+            prices, fit[list(prices.columns)], chain=chain
+        )
+
+
+# ==================================================
+# BASKET SCAN
+# ==================================================
+
+def enumerate_baskets(
+    columns,
+    sizes=(3, 4),
+    neighbours: dict | None = None,
+) -> list:
+    """
+    Candidate baskets (tuples in column order)
+
+    neighbours : {ticker: [nearest tickers]} (e.g. from
+        DistanceIndex.nearest) → only baskets inside a
+        ticker's neighbourhood, O(N · C(k, size - 1))
+        instead of O(C(N, size))
+    """
+    cols = list(columns)
+    pos = {c: i for i, c in enumerate(cols)}
+
+    if neighbours is None:
+        return [b for n in sizes for b in combinations(cols, n)]
+
+    out = set()
+    for ticker, near in neighbours.items():
+        for n in sizes:
+            for rest in combinations(near, n - 1):
+                if ticker in rest:
+                    continue
+                out.add(tuple(sorted((ticker, *rest), key=pos.get)))
+    return sorted(out, key=lambda b: (len(b), [pos[c] for c in b]))
+
+
+def scan_baskets(
+    prices: pd.DataFrame,
+    sizes=(3, 4),
+    window: int = 250,
+    end: int | None = None,
+    k_ar_diff: int = 1,
+    signif: float = 0.05,
+    neighbours: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Johansen test of every candidate basket on one window
+    [end - window, end), batched per basket size.
+
+    Sorted by trace0 / crit0 (strength of rank >= 1).
+    """
+    end = len(prices) if end is None else end
+    P = prices.iloc[end - window : end]
+    P = P.loc[:, P.notna().all()]
+
+    baskets = enumerate_baskets(P.columns, sizes, neighbours)
+    pos = {c: i for i, c in enumerate(P.columns)}
+    values = P.to_numpy(dtype=float)
+
+    rows = []
+    for n in sizes:
+        group = [b for b in baskets if len(b) == n]
+        if not group:
+            continue
+
+        idx = np.array([[pos[c] for c in b] for b in group])
+        res = johansen_batch(
+            np.moveaxis(values[:, idx], 1, 0), k_ar_diff
+        )
+        crit = trace_critical_values(n, signif)
+        rank = coint_rank(res["trace"], crit)
+
+        lead = res["evec"][:, :, 0]
+        weights = lead / lead[:, :1]
+
+        for b, w, tr, r in zip(group, weights, res["trace"], rank):
+            rows.append({
+                "basket": "-".join(b),
+                "legs": b,
+                "weights": tuple(w),
+                "trace0": tr[0],
+                "crit0": crit[0],
+                "strength": tr[0] / crit[0],
+                "rank": int(r),
+            })
+
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    return df.sort_values("strength", ascending=False).reset_index(drop=True)
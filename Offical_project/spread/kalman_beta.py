@@ -65,3 +65,14 @@ class KalmanBeta:
             betas.append(beta_t)
 
         return pd.Series(betas, index=x.index, name="beta_kalman")
+
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> dict:
+        return {"beta": self.beta, "P": self.P}
+
+    def set_state(self, state: dict):
+        self.beta = state["beta"]
+        self.P = state["P"]
@@ -0,0 +1,247 @@
+# spread/kalman_tuning.py
+
+import numpy as np
+import pandas as pd
+
+from spread.kalman_beta import KalmanBeta
+
+
+class KalmanMLE:
+    """
+    Maximum-likelihood tuning of KalmanBeta noise (q, r)
+
+    - Innovation log-likelihood on a log-spaced (q, r) grid
+    - All grid points filtered together: one pass over time,
+      array ops across the grid (cost ~ one filter run per pass)
+    - Optional refinement pass around the best grid point
+    - Optional intercept state: x = alpha + beta * y + e
+    """
+
+    def __init__(
+        self,
+        q_grid=None,
+        r_grid=None,
+        intercept: bool = False,
+        refine: bool = True,
+        refine_points: int = 7,
+        burn_in: int = 20,
+        init_beta: float = 1.0,
+        init_var: float = 1.0,
+        clip: tuple = (-5.0, 5.0),
+    ):
+        """
+        Parameters
+        ----------
+        q_grid, r_grid : array-like | None
+            Candidate process / observation noise values
+            (default: 9 log-spaced points each)
+
+        refine_points : int
+            Points per axis for the refinement grid, spanning one
+            coarse step either side of the best point (log space)
+
+        burn_in : int
+            Observations excluded from the likelihood while the
+            filter forgets init_beta / init_var
+        """
+        self.q_grid = np.asarray(
+            q_grid if q_grid is not None else np.logspace(-8, -2, 9),
+            dtype=float,
+        )
+        self.r_grid = np.asarray(
+            r_grid if r_grid is not None else np.logspace(-6, -1, 9),
+            dtype=float,
+        )
+        self.intercept = intercept
+        self.refine = refine
+        self.refine_points = refine_points
+        self.burn_in = burn_in
+
+        self.init_beta = init_beta
+        self.init_var = init_var
+        self.clip = clip
+
+    # ====================================================
+    # FIT
+    # ====================================================
+
+    def fit(self, x: pd.Series, y: pd.Series) -> dict:
+        """
+        Returns
+        -------
+        dict
+            q, r, loglik       : best point
+            intercept          : bool
+            surface            : DataFrame of log-likelihood
+                                 (index=q, columns=r), coarse grid
+            refined_surface    : same on the refinement grid (or None)
+        """
+        xv, yv = self._clean(x, y)
+
+        surface = self.loglik_surface(xv, yv, self.q_grid, self.r_grid)
+        q, r, best = self._argmax(surface)
+
+        refined = None
+        if self.refine:
+            q_fine = self._refine_axis(self.q_grid, q)
+            r_fine = self._refine_axis(self.r_grid, r)
+
+            refined = self.loglik_surface(xv, yv, q_fine, r_fine)
+            q_ref, r_ref, best_ref = self._argmax(refined)
+
+            if best_ref >= best:
+                q, r, best = q_ref, r_ref, best_ref
+
+        return {
+            "q": q,
+            "r": r,
+            "loglik": best,
+            "intercept": self.intercept,
+            "surface": surface,
+            "refined_surface": refined,
+        }
+
+    def kalman(self, fit: dict) -> KalmanBeta:
+        """
+        KalmanBeta with fitted noise (slope-only model)
+        """
+        if fit["intercept"]:
+            raise ValueError(
+                "KalmanBeta has no intercept state; "
+                "fit with intercept=False"
+            )
+
+        return KalmanBeta(
+            q=fit["q"],
+            r=fit["r"],
+            init_beta=self.init_beta,
+            init_var=self.init_var,
+            clip=self.clip,
+        )
+
+    # ====================================================
+    # VECTORIZED LIKELIHOOD
+    # ====================================================
+
+    def loglik_surface(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        q_grid: np.ndarray,
+        r_grid: np.ndarray,
+    ) -> pd.DataFrame:
+        """
+        Innovation log-likelihood for every (q, r) on the grid
+        """
+        Q, R = np.meshgrid(q_grid, r_grid, indexing="ij")
+        q = Q.ravel()
+        r = R.ravel()
+
+        if self.intercept:
+            ll = self._loglik_intercept(x, y, q, r)
+        else:
+            ll = self._loglik_slope(x, y, q, r)
+
+        return pd.DataFrame(
+            ll.reshape(Q.shape),
+            index=pd.Index(q_grid, name="q"),
+            columns=pd.Index(r_grid, name="r"),
+        )
+
+    def _loglik_slope(self, x, y, q, r) -> np.ndarray:
+        G = len(q)
+        beta = np.full(G, self.init_beta)
+        P = np.full(G, self.init_var)
+        ll = np.zeros(G)
+        lo, hi = self.clip
+
+        for t in range(len(x)):
+            H = y[t]
+
+            # ---------- Predict ----------
+            P_pred = P + q
+
+            # ---------- Update ----------
+            v = x[t] - H * beta
+            S = H * H * P_pred + r
+            K = P_pred * H / S
+
+            beta = np.clip(beta + K * v, lo, hi)
+            P = (1.0 - K * H) * P_pred
+
+            if t >= self.burn_in:
+                ll -= 0.5 * (np.log(2.0 * np.pi * S) + v * v / S)
+
+        return ll
+
+    def _loglik_intercept(self, x, y, q, r) -> np.ndarray:
+        G = len(q)
+        alpha = np.zeros(G)
+        beta = np.full(G, self.init_beta)
+
+        # symmetric 2x2 covariance stored as (P00, P01, P11)
+        P00 = np.full(G, self.init_var)
+        P01 = np.zeros(G)
+        P11 = np.full(G, self.init_var)
+
+        ll = np.zeros(G)
+        lo, hi = self.clip
+
+        for t in range(len(x)):
+            H = y[t]  # H = [1, y_t]
+
+            # ---------- Predict ----------
+            P00 = P00 + q
+            P11 = P11 + q
+
+            # ---------- Update ----------
+            v = x[t] - alpha - H * beta
+            PH0 = P00 + H * P01
+            PH1 = P01 + H * P11
+            S = PH0 + H * PH1 + r
+
+            alpha = alpha + PH0 / S * v
+            beta = np.clip(beta + PH1 / S * v, lo, hi)
+
+            P00 = P00 - PH0 * PH0 / S
+            P01 = P01 - PH0 * PH1 / S
+            P11 = P11 - PH1 * PH1 / S
+
+            if t >= self.burn_in:
+                ll -= 0.5 * (np.log(2.0 * np.pi * S) + v * v / S)
+
+        return ll
+
+    # ====================================================
+    # HELPERS
+    # ====================================================
+
+    @staticmethod
+    def _clean(x: pd.Series, y: pd.Series):
+        df = pd.concat([x, y], axis=1).dropna()
+        return (
+            df.iloc[:, 0].to_numpy(dtype=float),
+            df.iloc[:, 1].to_numpy(dtype=float),
+        )
+
+    @staticmethod
+    def _argmax(surface: pd.DataFrame):
+        values = surface.to_numpy()
+        i, j = np.unravel_index(np.nanargmax(values), values.shape)
+        return (
+            float(surface.index[i]),
+            float(surface.columns[j]),
+            float(values[i, j]),
+        )
+
+    def _refine_axis(self, grid: np.ndarray, best: float) -> np.ndarray:
+        # one coarse step either side of best in log space;
+        # also reaches past the grid edge when best sits on it
+        log_grid = np.log10(np.sort(grid))
+        step = float(np.median(np.diff(log_grid))) if len(grid) > 1 else 1.0
+
+        return np.logspace(
+            np.log10(best) - step,
+            np.log10(best) + step,
+            self.refine_points,
+        )
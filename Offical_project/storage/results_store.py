@@ -0,0 +1,342 @@
+# storage/results_store.py
+
+import hashlib
+import json
+import queue
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utility.compact import SlotRecord, records_to_frame, REGIME_CODES
+from regime.classifier import RegimeRecord
+
+
+TABLES = ("backtest", "regime", "rolling")
+PARTITION_COLS = ["pair", "param_hash"]
+
+
+def param_hash(params: Dict[str, Any] | str, length: int = 16) -> str:
+    """
+    Stable short hash of a parameter dict
+    (a string is taken as an already-computed hash)
+    """
+    if isinstance(params, str):
+        return params
+
+    blob = _canonical(params).encode()
+    return hashlib.sha256(blob).hexdigest()[:length]
+
+
+def _canonical(params: dict) -> str:
+    """
+    Comparable form of a parameter dict, as stored in _params/
+    """
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class ParquetResultsStore:
+    """
+    Partitioned columnar store for run outputs
+
+        <root>/<table>/pair=<pair>/param_hash=<hash>/part-*.parquet
+        <root>/_params/<hash>.json
+
+    - Tables: backtest (SpreadBacktest.finalize),
+              regime (RegimeClassifier outputs),
+              rolling (RollingPerformanceMetrics.run)
+    - Writes are buffered and flushed by a background thread
+    - query() prunes partitions and pushes column / date
+      predicates down to the Parquet reader
+    """
+
+    def __init__(self, root: str, flush_rows: int = 100_000):
+        self.root = Path(root)
+        self.flush_rows = flush_rows
+
+        self._buffers: Dict[str, List[pd.DataFrame]] = {
+            t: [] for t in TABLES
+        }
+        self._buffered_rows: Dict[str, int] = {t: 0 for t in TABLES}
+        self._lock = threading.Lock()
+
+        self._queue: queue.Queue = queue.Queue()
+        self._errors: List[BaseException] = []
+        self._writer = threading.Thread(
+            target=self._write_loop, daemon=True
+        )
+        self._writer.start()
+
+    # ====================================================
+    # WRITE API
+    # ====================================================
+
+    def write_backtest(self, df: pd.DataFrame, pair: str, params):
+        """
+        SpreadBacktest.finalize(index=dates) output
+        """
+        self.write("backtest", df, pair, params)
+
+    def write_regime(
+        self,
+        outputs,
+        pair: str,
+        params,
+        index: pd.Index | None = None,
+    ):
+        """
+        RegimeClassifier outputs: the raw list of per-bar dicts /
+        RegimeRecord (None for warm-up bars) aligned with `index`
+        (dates), or the matching WalkForwardEngine.frames() entry.
+
+        Outputs are flattened to the RegimeRecord schema
+        (int8 regime_code, float32 scores) and warm-up bars dropped,
+        so compact and dict runs share one table schema.
+        """
+        self.write(
+            "regime", self._regime_frame(outputs, index), pair, params
+        )
+
+    def write_rolling(self, df: pd.DataFrame, pair: str, params):
+        """
+        RollingPerformanceMetrics.run output
+        """
+        self.write("rolling", df, pair, params)
+
+    def write(self, table: str, df: pd.DataFrame, pair: str, params):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table `{table}`, expected {TABLES}")
+        self._raise_writer_error()
+
+        key = param_hash(params)
+        if not isinstance(params, str):
+            self.register_params(key, params)
+
+        df = self._with_keys(df, pair, key)
+
+        with self._lock:
+            self._buffers[table].append(df)
+            self._buffered_rows[table] += len(df)
+            full = self._buffered_rows[table] >= self.flush_rows
+
+        if full:
+            self._flush_table(table)
+
+    def flush(self):
+        """
+        Hand every buffer to the writer and wait until on disk
+        """
+        for table in TABLES:
+            self._flush_table(table)
+        self._queue.join()
+        self._raise_writer_error()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ====================================================
+    # QUERY API
+    # ====================================================
+
+    def query(
+        self,
+        table: str,
+        columns: List[str] | None = None,
+        pairs: List[str] | None = None,
+        params: List | None = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        Load selected columns for selected pairs / parameter
+        sets / date range. Partition filters prune directories,
+        the date filter is pushed down to row groups.
+
+        params: hashes, or parameter dicts — a dict matches its
+        own param_hash and every key registered under an equal
+        dict in _params/ (BatchRunner keys runs by job_hash)
+        """
+        path = self.root / table
+        if not path.exists():
+            return pd.DataFrame(columns=columns)
+
+        dataset = ds.dataset(
+            path, format="parquet", partitioning="hive"
+        )
+
+        expr = None
+        if pairs is not None:
+            expr = self._and(expr, ds.field("pair").isin(list(pairs)))
+        if params is not None:
+            hashes = self._resolve(params)
+            expr = self._and(expr, ds.field("param_hash").isin(hashes))
+        if start is not None:
+            expr = self._and(
+                expr, ds.field("date") >= pd.Timestamp(start).to_datetime64()
+            )
+        if end is not None:
+            expr = self._and(
+                expr, ds.field("date") <= pd.Timestamp(end).to_datetime64()
+            )
+
+        if columns is not None:
+            columns = list(dict.fromkeys(
+                ["date", *PARTITION_COLS, *columns]
+            ))
+
+        df = dataset.to_table(columns=columns, filter=expr).to_pandas()
+        for col in PARTITION_COLS:
+            if col in df:
+                df[col] = df[col].astype(str)
+        return df
+
+    def list_runs(self, table: str = "backtest") -> pd.DataFrame:
+        """
+        (pair, param_hash) partitions present for a table
+        """
+        path = self.root / table
+        runs = [
+            {
+                "pair": p.parent.name.split("=", 1)[1],
+                "param_hash": p.name.split("=", 1)[1],
+            }
+            for p in path.glob("pair=*/param_hash=*")
+        ]
+        return pd.DataFrame(runs, columns=PARTITION_COLS)
+
+    def drop_run(self, pair: str, params):
+        """
+        Delete one (pair, param_hash) partition from every table,
+        so re-writing a run replaces it instead of appending
+        """
+        self.flush()
+        key = param_hash(params)
+        for table in TABLES:
+            path = self.root / table / f"pair={pair}" / f"param_hash={key}"
+            if path.exists():
+                shutil.rmtree(path)
+
+    def params(self, key: str) -> dict:
+        """
+        Parameter dict behind a param_hash
+        """
+        with open(self.root / "_params" / f"{key}.json", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ====================================================
+    # HELPERS
+    # ====================================================
+
+    def _resolve(self, params: list) -> list:
+        """
+        params (hashes / dicts) → param_hash partition keys
+        """
+        keys = [param_hash(p) for p in params]
+        wanted = [_canonical(p) for p in params if not isinstance(p, str)]
+        if wanted:
+            for path in (self.root / "_params").glob("*.json"):
+                with open(path, encoding="utf-8") as f:
+                    if _canonical(json.load(f)) in wanted:
+                        keys.append(path.stem)
+        return list(dict.fromkeys(keys))
+
+    @staticmethod
+    def _and(expr, other):
+        return other if expr is None else expr & other
+
+    @staticmethod
+    def _regime_frame(outputs, index: pd.Index | None) -> pd.DataFrame:
+        if isinstance(outputs, pd.DataFrame):
+            df = outputs
+        elif any(isinstance(o, SlotRecord) for o in outputs):
+            df = records_to_frame(outputs, index=index)
+        else:
+            df = pd.json_normalize([o or {} for o in outputs])
+            if index is not None and len(index) == len(df):
+                df.index = index
+
+        # engine.frames() / json_normalize → "scores.mr", "raw.adf_p"
+        df = df.rename(columns=lambda c: c.split(".")[-1])
+
+        if "regime_code" not in df:
+            if "regime" not in df:
+                return pd.DataFrame(columns=list(RegimeRecord.DTYPES))
+            df["regime_code"] = df["regime"].map(REGIME_CODES).fillna(-1)
+
+        df = df[df["regime_code"] >= 0]
+        return df[list(RegimeRecord.DTYPES)].astype(RegimeRecord.DTYPES)
+
+    @staticmethod
+    def _with_keys(df: pd.DataFrame, pair: str, key: str) -> pd.DataFrame:
+        df = df.copy()
+
+        # cached prices carry mixed UTC offsets → string index
+        if not pd.api.types.is_numeric_dtype(df.index):
+            dates = pd.to_datetime(df.index, utc=True).tz_localize(None)
+            df.insert(0, "date", dates)
+
+        df = df.reset_index(drop=True)
+        df["pair"] = pair
+        df["param_hash"] = key
+        return df
+
+    def register_params(self, key: str, params: dict):
+        """
+        Record the parameter dict behind a precomputed hash
+        """
+        path = self.root / "_params" / f"{key}.json"
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(params, f, sort_keys=True, default=str, indent=2)
+
+    def _flush_table(self, table: str):
+        with self._lock:
+            frames = self._buffers[table]
+            self._buffers[table] = []
+            self._buffered_rows[table] = 0
+
+        if frames:
+            self._queue.put((table, frames))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                table, frames = item
+                data = pa.Table.from_pandas(
+                    pd.concat(frames, ignore_index=True),
+                    preserve_index=False,
+                )
+                pq.write_to_dataset(
+                    data,
+                    root_path=str(self.root / table),
+                    partition_cols=PARTITION_COLS,
+                    basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+            except BaseException as exc:  # surfaced on next write/flush
+                self._errors.append(exc)
+            finally:
+                self._queue.task_done()
+
+    def _raise_writer_error(self):
+        if self._errors:
+            raise RuntimeError("Background parquet write failed") from self._errors[0]
@@ -3,6 +3,38 @@
 import pandas as pd
 import numpy as np
 
+from utility.compact import SlotRecord, regime_code, regime_label
+from utility.rolling_moments import shared_moments
+from utility.order_stats import MAD_SCALE, SortedWindow, quantile_scale
+from selection.universe import is_active
+
+
+MODES = ("mean", "mad", "quantile")
+
+
+class SignalRecord(SlotRecord):
+    """
+    Flat, fixed-schema signal output (compact mode)
+    """
+
+    __slots__ = (
+        "signal", "z", "position", "raw_position",
+        "regime_code", "multiplier",
+    )
+
+    DTYPES = {
+        "signal": "float32",
+        "z": "float32",
+        "position": "float32",
+        "raw_position": "int8",
+        "regime_code": "int8",
+        "multiplier": "float32",
+    }
+
+    @property
+    def regime(self) -> str | None:
+        return regime_label(self.regime_code)
+
 
 class ZScoreSignal:
     """
@@ -10,6 +42,15 @@ class ZScoreSignal:
     - Always allow all regimes
     - Position size scaled by regime multiplier
     - Direction determined by sign of z-score
+    - Flat while `pair` (either orientation) is outside
+      UniverseSelector's active set
+
+    mode (location / scale of the window before t):
+        mean     : mean / std
+        mad      : median / (1.4826 * MAD)
+        quantile : median / ((q_hi - q_lo) / normal quantile gap)
+    Robust modes keep a SortedWindow advanced one bar per step,
+    so a single-day shock barely moves the scale.
     """
 
     def __init__(
@@ -17,13 +58,37 @@ class ZScoreSignal:
         window: int = 20,
         entry_z: float = 2.0,
         exit_z: float = 0.5,
+        compact: bool = False,
+        mode: str = "mean",
+        quantiles: tuple = (0.25, 0.75),
     ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+
         self.window = window
         self.entry_z = entry_z
         self.exit_z = exit_z
+        self.compact = compact
+        self.mode = mode
+        self.quantiles = quantiles
+        self._q_scale = quantile_scale(*quantiles)
 
         self.position = 0  # -1, 0, +1
 
+        # robust modes: window of spread[t - window : t]
+        self._order: SortedWindow | None = None
+        self._order_t: int | None = None
+
+    # walk-forward graph
+    inputs = ("RegimeClassifier", "UniverseSelector")
+
+    @property
+    def lookback(self) -> int:
+        """
+        Bars of history needed before t
+        """
+        return self.window
+
     # ====================================================
     # WALK-FORWARD STEP
     # ====================================================
@@ -33,6 +98,8 @@ class ZScoreSignal:
         t: int,
         spread: pd.Series,
         RegimeClassifier: dict | None = None,
+        UniverseSelector: dict | None = None,
+        pair: str | None = None,
         **_
     ):
         """
@@ -43,25 +110,15 @@ class ZScoreSignal:
         # NEED HISTORY
         # -----------------------------------------------
         if t < self.window:
-            return {
-                "signal": 0.0,
-                "z": np.nan,
-                "position": 0.0,
-            }
+            return self._flat(np.nan)
 
         # -----------------------------------------------
         # Z-SCORE
         # -----------------------------------------------
-        hist = spread.iloc[t - self.window : t]
-        mu = hist.mean()
-        sigma = hist.std()
+        mu, sigma = self._location_scale(t, spread)
 
         if sigma == 0 or np.isnan(sigma):
-            return {
-                "signal": 0.0,
-                "z": 0.0,
-                "position": 0.0,
-            }
+            return self._flat(0.0)
 
         z = (spread.iloc[t] - mu) / sigma
 
@@ -91,8 +148,26 @@ class ZScoreSignal:
             if regime is not None:
                 multiplier = RegimeClassifier["position_multiplier"]
 
+        # -----------------------------------------------
+        # UNIVERSE (pair deselected → close out)
+        # -----------------------------------------------
+        if UniverseSelector is not None and pair is not None:
+            if not is_active(pair, UniverseSelector["active_legs"]):
+                self.position = 0
+                multiplier = 0.0
+
         sized_position = self.position * multiplier
 
+        if self.compact:
+            return SignalRecord(
+                signal=sized_position,
+                z=float(z),
+                position=sized_position,
+                raw_position=self.position,
+                regime_code=regime_code(regime),
+                multiplier=multiplier,
+            )
+
         return {
             "signal": sized_position,
             "z": z,
@@ -101,3 +176,86 @@ class ZScoreSignal:
             "regime": regime,
             "multiplier": multiplier,
         }
+
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> dict:
+        order = None
+        if self._order is not None:
+            order = (self._order_t, self._order.get_state())
+        return {"position": self.position, "order": order}
+
+    def set_state(self, state: dict):
+        self.position = state["position"]
+
+        self._order, self._order_t = None, None
+        if state.get("order") is not None:
+            self._order_t, values = state["order"]
+            self._order = SortedWindow(self.window)
+            self._order.set_state(values)
+
+    # ====================================================
+    # LOCATION / SCALE
+    # ====================================================
+
+    def _location_scale(self, t: int, spread) -> tuple:
+        """
+        (location, scale) of spread[t - window : t]
+        """
+        if self.mode == "mean":
+            # O(1) lookups in the spread's shared RollingMoments;
+            # slice only for containers without one (RingSeries)
+            moments = shared_moments(spread)
+            if moments is None:
+                hist = spread.iloc[t - self.window : t]
+                return hist.mean(), hist.std()
+            return (
+                moments.mean(self.window, lag=1, min_periods=1)[t],
+                moments.std(self.window, lag=1, min_periods=1)[t],
+            )
+
+        win = self._robust_window(t, spread)
+        if self.mode == "mad":
+            return win.median(), MAD_SCALE * win.mad()
+
+        lo, hi = self.quantiles
+        width = win.quantile(hi) - win.quantile(lo)
+        return win.median(), width / self._q_scale
+
+    def _robust_window(self, t: int, spread) -> SortedWindow:
+        """
+        Advance by spread[t - 1] on consecutive steps,
+        rebuild from the slice otherwise (first step, skips)
+        """
+        if self._order is not None and self._order_t == t - 1:
+            self._order.push(spread.iloc[t - 1])
+        else:
+            self._order = SortedWindow(self.window)
+            for v in spread.iloc[t - self.window : t]:
+                self._order.push(v)
+
+        self._order_t = t
+        return self._order
+
+    # ====================================================
+    # HELPERS
+    # ====================================================
+
+    def _flat(self, z: float):
+        if self.compact:
+            return SignalRecord(
+                signal=0.0,
+                z=z,
+                position=0.0,
+                raw_position=0,
+                regime_code=regime_code(None),
+                multiplier=0.0,
+            )
+
+        return {
+            "signal": 0.0,
+            "z": z,
+            "position": 0.0,
+        }
@@ -0,0 +1,81 @@
+# utility/checkpoint.py
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict
+
+
+CHECKPOINT_VERSION = 1
+
+
+# ==================================================
+# DISK I/O
+# ==================================================
+
+def save_checkpoint(path: str, payload: Dict[str, Any]):
+    """
+    Atomically write a checkpoint payload to disk.
+
+    Written to `<path>.tmp` first then renamed, so a crash
+    mid-write never leaves a truncated checkpoint behind.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(
+            {"version": CHECKPOINT_VERSION, **payload},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Load a checkpoint payload written by save_checkpoint.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Checkpoint {path} not found")
+
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+
+    version = payload.pop("version", None)
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Unsupported checkpoint version {version} in {path}"
+        )
+
+    return payload
+
+
+# ==================================================
+# MODULE STATE
+# ==================================================
+
+def get_module_state(module) -> Dict[str, Any] | None:
+    """
+    Module state via module.get_state() (None if stateless)
+    """
+    getter = getattr(module, "get_state", None)
+    if getter is None:
+        return None
+    return getter()
+
+
+def set_module_state(module, state: Dict[str, Any] | None):
+    """
+    Restore module state via module.set_state(state)
+    """
+    if state is None:
+        return
+
+    setter = getattr(module, "set_state", None)
+    if setter is None:
+        raise TypeError(
+            f"{module.__class__.__name__} has saved state "
+            "but does not implement set_state"
+        )
+    setter(state)
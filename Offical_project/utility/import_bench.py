@@ -0,0 +1,90 @@
+# utility/import_bench.py
+#
+# Usage (from Offical_project/):
+#     python -m utility.import_bench
+#     python -m utility.import_bench batch.pipeline --repeat 5 --budget 1.5
+
+import argparse
+import subprocess
+import sys
+
+import pandas as pd
+
+
+# core pipeline: must import without these
+HEAVY = ("sklearn", "statsmodels", "yfinance", "scipy")
+
+MODULES = (
+    "data.data_loader",
+    "utility.time_series",
+    "utility.stat_tests",
+    "spread.hedge_ratio",
+    "spread.kalman_beta",
+    "regime.classifier",
+    "trading_signals.zscore",
+    "execution.backtest",
+    "walk_forward.engine",
+    "batch.pipeline",
+)
+
+_PROBE = (
+    "import sys, time; t0 = time.perf_counter(); import {module}; "
+    "dt = time.perf_counter() - t0; "
+    "print(dt, ','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def time_import(module: str) -> tuple:
+    """
+    Cold import of `module` in a fresh interpreter (what a pool
+    worker pays). Returns (seconds, heavy modules loaded)
+    """
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    heavy = out[1].split(",") if len(out) > 1 else []
+    return float(out[0]), heavy
+
+
+def benchmark(modules=MODULES, repeat: int = 3) -> pd.DataFrame:
+    """
+    Best-of-`repeat` cold import time per module
+    """
+    rows = []
+    for module in modules:
+        runs = [time_import(module) for _ in range(repeat)]
+        rows.append({
+            "module": module,
+            "seconds": min(s for s, _ in runs),
+            "heavy": ",".join(runs[0][1]),
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utility.import_bench",
+        description="Cold import time of the core pipeline modules",
+    )
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--budget", type=float, default=None,
+        help="fail if any module takes longer (seconds)",
+    )
+    args = parser.parse_args(argv)
+
+    df = benchmark(args.modules, args.repeat)
+    print(df.to_string(index=False))
+
+    failed = df["heavy"] != ""
+    if args.budget is not None:
+        failed |= df["seconds"] > args.budget
+    return 1 if failed.any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
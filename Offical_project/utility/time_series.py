@@ -2,7 +2,6 @@
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
 
 
 class TimeSeriesStats:
@@ -14,12 +13,9 @@ class TimeSeriesStats:
         ret = spread.diff().dropna()
         lag = lag.loc[ret.index]
 
-        model = LinearRegression().fit(
-            lag.values.reshape(-1, 1),
-            ret.values
-        )
-
-        beta = model.coef_[0]
+        # ret = a + beta * lag (NumPy least squares, no sklearn)
+        X = np.column_stack([lag.values, np.ones(len(lag))])
+        beta = np.linalg.lstsq(X, ret.values, rcond=None)[0][0]
         if beta >= 0:
             return np.inf
 
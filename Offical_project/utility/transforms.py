@@ -2,11 +2,24 @@
 
 import pandas as pd
 
+from utility.order_stats import robust_zscore
+from utility.rolling_moments import shared_moments
+
 
 class Transforms:
 
     @staticmethod
     def zscore(series: pd.Series, window=60) -> pd.Series:
-        mean = series.rolling(window).mean()
-        std = series.rolling(window).std()
-        return (series - mean) / std
+        m = shared_moments(series)
+        if m is None:
+            # not a pd.Series (e.g. DataFrame): plain rolling
+            mean = series.rolling(window).mean()
+            std = series.rolling(window).std()
+            return (series - mean) / std
+        return m.series(m.zscore(window), name=series.name)
+
+    @staticmethod
+    def robust_zscore(
+        series: pd.Series, window=60, method="mad"
+    ) -> pd.Series:
+        return robust_zscore(series, window, method)
@@ -0,0 +1,319 @@
+# walk_forward/chunked.py
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from utility.compact import SlotRecord, records_to_frame
+from walk_forward.engine import module_name
+
+
+# ==================================================
+# RING BUFFER SERIES
+# ==================================================
+
+class RingSeries:
+    """
+    Fixed-capacity rolling window addressed by ABSOLUTE position
+
+    Mimics the slice of the pandas API modules use
+    (`len(s)`, `s.iloc[t]`, `s.iloc[a:b]`) so walk-forward
+    modules run unchanged on streamed data.
+
+    Values are written twice (at i and i + capacity) so any
+    window of length <= capacity is one contiguous view.
+    """
+
+    def __init__(self, capacity: int, name: str | None = None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.capacity = capacity
+        self.name = name
+
+        self._buf = np.full(2 * capacity, np.nan)
+        self._n = 0  # absolute number of values pushed
+
+    def push(self, value: float):
+        i = self._n % self.capacity
+        self._buf[i] = value
+        self._buf[i + self.capacity] = value
+        self._n += 1
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def iloc(self) -> "_RingIndexer":
+        return _RingIndexer(self)
+
+    # ----------------------------------------------
+    # absolute → buffer
+    # ----------------------------------------------
+
+    def _oldest(self) -> int:
+        return max(0, self._n - self.capacity)
+
+    def _scalar(self, t: int) -> float:
+        if t < 0:
+            t += self._n
+        if not self._oldest() <= t < self._n:
+            raise IndexError(
+                f"Position {t} outside retained window "
+                f"[{self._oldest()}, {self._n})"
+            )
+        return float(self._buf[t % self.capacity])
+
+    def _slice(self, sl: slice) -> pd.Series:
+        start, stop, step = sl.indices(self._n)
+        if step != 1:
+            raise ValueError("RingSeries only supports step=1 slices")
+
+        stop = max(start, stop)
+        if start < self._oldest():
+            raise IndexError(
+                f"Slice start {start} older than retained window "
+                f"(lookback too short, oldest={self._oldest()})"
+            )
+
+        i = start % self.capacity
+        values = self._buf[i : i + (stop - start)]
+        return pd.Series(
+            values.copy(),
+            index=pd.RangeIndex(start, stop),
+            name=self.name,
+        )
+
+
+class _RingIndexer:
+
+    def __init__(self, series: RingSeries):
+        self._s = series
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._s._slice(key)
+        return self._s._scalar(int(key))
+
+
+# ==================================================
+# CHUNK SOURCES
+# ==================================================
+
+def csv_chunks(
+    path: str,
+    columns: List[str],
+    chunk_size: int = 100_000,
+    index_col: int | str | None = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream selected columns of a CSV in blocks of chunk_size rows
+    """
+    usecols = None
+    if index_col is None:
+        usecols = columns
+    elif isinstance(index_col, str):
+        usecols = [index_col] + columns
+
+    for chunk in pd.read_csv(
+        path,
+        index_col=index_col,
+        usecols=usecols,
+        chunksize=chunk_size,
+    ):
+        yield chunk[columns]
+
+
+def kalman_spread_chunks(
+    chunks: Iterable[pd.DataFrame],
+    kalman,
+    x_col: str = "x",
+    y_col: str = "y",
+) -> Iterator[pd.DataFrame]:
+    """
+    Add `beta` and `spread` columns chunk by chunk.
+
+    KalmanBeta keeps (beta, P) between run() calls, so the
+    streamed spread equals KalmanBeta().run on the full history.
+    """
+    from spread.builder import SpreadBuilder
+
+    for chunk in chunks:
+        beta = kalman.run(chunk[x_col], chunk[y_col])
+        chunk = chunk.copy()
+        chunk["beta"] = beta
+        chunk["spread"] = SpreadBuilder.build(
+            chunk[x_col], chunk[y_col], beta
+        )
+        yield chunk
+
+
+def read_outputs(output_dir: str, name: str) -> pd.DataFrame:
+    """
+    Concatenate the flushed parts of one module's output
+    """
+    parts = sorted((Path(output_dir) / name).glob("part-*.csv"))
+    if not parts:
+        raise FileNotFoundError(f"No output parts for {name} in {output_dir}")
+
+    return pd.concat(
+        [pd.read_csv(p, index_col=0) for p in parts]
+    )
+
+
+# ==================================================
+# ENGINE
+# ==================================================
+
+class ChunkedWalkForwardEngine:
+    """
+    Out-of-core walk-forward engine
+
+    - Streams price blocks from disk
+    - Keeps only max(module.lookback) bars per column (RingSeries)
+    - Flushes module outputs after every block to
+      `<output_dir>/<Module>/part-00000.csv`, part-00001.csv, ...
+      (parts of an earlier run in the same directory are
+      removed when run() starts)
+
+    Memory stays O(lookback + chunk_size), independent of
+    history length. Modules see the same absolute t as in
+    WalkForwardEngine, so fixed clocks (t % ADF_STEP) match.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        modules: List[Any],
+        output_dir: str,
+        lookback: int | None = None,
+        start_index: int = 0,
+    ):
+        """
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            Blocks of consecutive bars; columns become data keys
+            (e.g. csv_chunks / kalman_spread_chunks)
+
+        modules : list
+            Walk-forward modules. Each may declare `lookback`
+            (bars of history needed before t).
+
+        output_dir : str
+            Directory for incremental output CSVs
+
+        lookback : int | None
+            Override the window kept in memory
+            (default: max declared module lookback)
+        """
+        self.chunks = chunks
+        self.modules = modules
+        self.output_dir = Path(output_dir)
+        self.start_index = start_index
+
+        self.lookback = (
+            lookback if lookback is not None
+            else max(
+                [getattr(m, "lookback", 0) for m in modules] + [1]
+            )
+        )
+
+        self.last_t: int | None = None
+        self._part = 0
+
+    # ====================================================
+    # RUN ENGINE
+    # ====================================================
+
+    def run(self) -> Dict[str, Path]:
+        """
+        Run walk-forward over the streamed timeline.
+        Returns {module_name: output directory}
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # stale parts would be globbed by read_outputs
+        for module in self.modules:
+            for part in self._path(module_name(module)).glob("part-*.csv"):
+                part.unlink()
+
+        # + 1 → current bar t is held next to its lookback
+        capacity = self.lookback + 1
+        rings: Dict[str, RingSeries] = {}
+        self._part = 0
+
+        t = -1
+        for chunk in self.chunks:
+            if not rings:
+                rings = {
+                    col: RingSeries(capacity, name=col)
+                    for col in chunk.columns
+                }
+
+            buffers = {
+                module_name(m): [] for m in self.modules
+            }
+            index = []
+            values = chunk.to_numpy(dtype=float)
+            cols = list(chunk.columns)
+
+            for i, label in enumerate(chunk.index):
+                t += 1
+                for j, col in enumerate(cols):
+                    rings[col].push(values[i, j])
+
+                if t < self.start_index:
+                    continue
+
+                context = {}
+                for module in self.modules:
+                    name = module_name(module)
+                    out = module.step(t=t, **rings, **context)
+                    context[name] = out
+                    buffers[name].append(out)
+
+                index.append(label)
+                self.last_t = t
+
+            self._flush(buffers, index)
+
+        return {
+            module_name(m): self._path(module_name(m))
+            for m in self.modules
+        }
+
+    # ====================================================
+    # OUTPUT
+    # ====================================================
+
+    def _path(self, name: str) -> Path:
+        return self.output_dir / name
+
+    def _flush(self, buffers: Dict[str, list], index: list):
+        if not index:
+            return
+
+        idx = pd.Index(index, name="date")
+
+        for name, outs in buffers.items():
+            if any(isinstance(o, SlotRecord) for o in outs):
+                df = records_to_frame(outs, index=idx)
+            else:
+                df = pd.json_normalize([o or {} for o in outs])
+                df.index = idx
+
+            # one part per block: dict outputs may gain columns
+            # after warm-up, so parts do not share a header
+            path = self._path(name)
+            path.mkdir(parents=True, exist_ok=True)
+            df.to_csv(path / f"part-{self._part:05d}.csv")
+
+        self._part += 1
+
+        for module in self.modules:
+            hook = getattr(module, "on_flush", None)
+            if hook is not None:
+                hook()
@@ -1,6 +1,25 @@
 # walk_forward/engine.py
 
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterable
+
+import pandas as pd
+
+from utility.compact import SlotRecord, records_to_frame
+from utility.checkpoint import (
+    save_checkpoint,
+    load_checkpoint,
+    get_module_state,
+    set_module_state,
+)
+
+
+def module_name(module) -> str:
+    """
+    Context / output key of a module: `name` attribute if set,
+    else its class name
+    """
+    return getattr(module, "name", None) or module.__class__.__name__
 
 
 class WalkForwardEngine:
@@ -10,6 +29,30 @@ class WalkForwardEngine:
     - Single timeline loop
     - Module-agnostic
     - Walk-forward safe
+    - Checkpoint / resume for daily incremental runs
+    - Dependency-aware module graph
+
+    Optional module declarations:
+
+        inputs : tuple[str]
+            Names of modules whose output step() consumes.
+            Undeclared → every earlier module in the list
+            (the original strict-list behaviour).
+        warmup : int
+            step() is skipped (output None) while t < warmup
+        name : str
+            Output / context key (default: class name)
+
+    Modules are grouped into dependency levels; modules of one
+    level are independent and may run side by side.
+
+    Daily incremental run:
+
+        wf = WalkForwardEngine(data, modules)
+        wf.restore("state/XOM-CVX.pkl", extra={"kalman": kalman})
+        # extend x, y, spread with new bars, then
+        wf.run()                        # only t = last_t + 1 ...
+        wf.checkpoint("state/XOM-CVX.pkl", extra={"kalman": kalman})
     """
 
     def __init__(
@@ -17,6 +60,9 @@ class WalkForwardEngine:
         data: Dict[str, Any],
         modules: List[Any],
         start_index: int = 0,
+        retain: Iterable[str] | None = None,
+        max_workers: int = 1,
+        end_index: int | None = None,
     ):
         """
         Parameters
@@ -37,17 +83,44 @@ class WalkForwardEngine:
 
         start_index : int
             Earliest index to start walk-forward
+
+        retain : iterable of str | None
+            Module names whose per-bar outputs are kept
+            (None → all). Others only feed same-bar dependants.
+
+        max_workers : int
+            > 1 → run independent modules of a level in a
+            thread pool
+
+        end_index : int | None
+            Stop before this index (None → end of data);
+            raise it and call run() again to continue
         """
         self.data = data
         self.modules = modules
         self.start_index = start_index
+        self.end_index = end_index
+        self.max_workers = max_workers
+
+        names = [module_name(m) for m in modules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate module names: {names}")
+
+        self.retain = set(names) if retain is None else set(retain)
+        unknown = self.retain - set(names)
+        if unknown:
+            raise ValueError(f"Cannot retain unknown modules {sorted(unknown)}")
+
+        self.levels = self._build_levels()
 
         # output storage
         self.outputs: Dict[str, list] = {
-            module.__class__.__name__: []
-            for module in modules
+            name: [] for name in names if name in self.retain
         }
 
+        # last processed index (None → nothing run yet)
+        self.last_t: int | None = None
+
     # ====================================================
     # RUN ENGINE
     # ====================================================
@@ -58,24 +131,191 @@ class WalkForwardEngine:
         """
 
         T = self._infer_length()
+        if self.end_index is not None:
+            T = min(T, self.end_index)
+
+        start = (
+            self.start_index if self.last_t is None
+            else self.last_t + 1
+        )
 
-        for t in range(self.start_index, T):
-            context = {}
+        pool = None
+        if self.max_workers > 1 and any(len(lv) > 1 for lv in self.levels):
+            pool = ThreadPoolExecutor(max_workers=self.max_workers)
 
-            for module in self.modules:
-                name = module.__class__.__name__
+        try:
+            for t in range(start, T):
+                context = {}
 
-                out = module.step(
-                    t=t,
-                    **self.data,
-                    **context
-                )
+                for level in self.levels:
+                    if pool is None or len(level) == 1:
+                        for name, module, inputs in level:
+                            context[name] = self._step(
+                                t, module, inputs, context
+                            )
+                    else:
+                        futures = [
+                            (name, pool.submit(
+                                self._step, t, module, inputs, context
+                            ))
+                            for name, module, inputs in level
+                        ]
+                        for name, fut in futures:
+                            context[name] = fut.result()
 
-                context[name] = out
-                self.outputs[name].append(out)
+                for name in self.outputs:
+                    self.outputs[name].append(context[name])
+
+                self.last_t = t
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         return self.outputs
 
+    def _step(self, t: int, module, inputs, context: dict):
+        if t < getattr(module, "warmup", 0):
+            return None
+
+        if inputs is None:
+            ctx = dict(context)
+        else:
+            ctx = {k: context[k] for k in inputs if k in context}
+
+        return module.step(
+            t=t,
+            **self.data,
+            **ctx
+        )
+
+    # ====================================================
+    # MODULE GRAPH
+    # ====================================================
+
+    def _build_levels(self) -> List[list]:
+        """
+        Group modules into dependency levels (topological order,
+        list order kept inside a level)
+        """
+        names = [module_name(m) for m in self.modules]
+        present = set(names)
+
+        deps = {}
+        inputs = {}
+        for i, m in enumerate(self.modules):
+            declared = getattr(m, "inputs", None)
+            if declared is None:
+                inputs[names[i]] = None
+                deps[names[i]] = set(names[:i])
+            else:
+                # inputs from modules not in this run are optional
+                inputs[names[i]] = tuple(declared)
+                deps[names[i]] = set(declared) & present
+
+        level: Dict[str, int] = {}
+        visiting = set()
+
+        def resolve(name):
+            if name in level:
+                return level[name]
+            if name in visiting:
+                raise ValueError(f"Module dependency cycle at {name}")
+            visiting.add(name)
+            level[name] = 1 + max(
+                (resolve(d) for d in deps[name]), default=-1
+            )
+            visiting.discard(name)
+            return level[name]
+
+        for name in names:
+            resolve(name)
+
+        levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for name, m in zip(names, self.modules):
+            levels[level[name]].append((name, m, inputs[name]))
+        return levels
+
+    # ====================================================
+    # CHECKPOINT / RESUME
+    # ====================================================
+
+    def checkpoint(self, path: str, extra: Dict[str, Any] | None = None):
+        """
+        Snapshot engine + module state to disk
+
+        extra : dict
+            Objects outside the module list whose state must
+            survive too (e.g. {"kalman": KalmanBeta})
+        """
+        extra = extra or {}
+
+        save_checkpoint(path, {
+            "start_index": self.start_index,
+            "last_t": self.last_t,
+            "outputs": self.outputs,
+            "modules": {
+                module_name(module): get_module_state(module)
+                for module in self.modules
+            },
+            "extra": {
+                key: get_module_state(obj)
+                for key, obj in extra.items()
+            },
+        })
+
+    def restore(self, path: str, extra: Dict[str, Any] | None = None):
+        """
+        Restore state written by checkpoint(); the next run()
+        resumes at t = last_t + 1
+        """
+        extra = extra or {}
+        payload = load_checkpoint(path)
+
+        names = [module_name(m) for m in self.modules]
+        if sorted(names) != sorted(payload["modules"]):
+            raise ValueError(
+                f"Checkpoint modules {sorted(payload['modules'])} "
+                f"do not match engine modules {sorted(names)}"
+            )
+
+        for module in self.modules:
+            set_module_state(
+                module, payload["modules"][module_name(module)]
+            )
+
+        for key, obj in extra.items():
+            if key not in payload["extra"]:
+                raise KeyError(f"No saved state for extra object `{key}`")
+            set_module_state(obj, payload["extra"][key])
+
+        self.start_index = payload["start_index"]
+        self.last_t = payload["last_t"]
+        self.outputs = payload["outputs"]
+
+    # ====================================================
+    # OUTPUT FRAMES
+    # ====================================================
+
+    def frames(self, index: pd.Index | None = None) -> Dict[str, pd.DataFrame]:
+        """
+        Flatten every module's outputs into one DataFrame per module
+
+        - SlotRecord outputs (compact mode) → compact dtypes
+        - dict outputs → pd.json_normalize (None → empty row)
+        """
+        frames = {}
+
+        for name, outs in self.outputs.items():
+            if any(isinstance(o, SlotRecord) for o in outs):
+                frames[name] = records_to_frame(outs, index=index)
+            else:
+                df = pd.json_normalize([o or {} for o in outs])
+                if index is not None and len(index) == len(df):
+                    df.index = index
+                frames[name] = df
+
+        return frames
+
     # ====================================================
     # HELPERS
     # ====================================================
@@ -0,0 +1,242 @@
+# walk_forward/sharded.py
+
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from execution.backtest import SpreadBacktest
+from spread.builder import SpreadBuilder
+from spread.kalman_beta import KalmanBeta
+from walk_forward.engine import WalkForwardEngine, module_name
+
+
+# ==================================================
+# WORKER
+# ==================================================
+
+def _run_shard(
+    data: Dict[str, Any],
+    modules: List[Any],
+    warm_start: int,
+    start: int,
+    end: int,
+    kalman: dict | None = None,
+    kalman_start: int = 0,
+) -> Dict[str, list]:
+    """
+    Process-pool entry point: replay [warm_start, end) on fresh
+    module copies, keep outputs of [start, end)
+    """
+    if kalman is not None:
+        data = dict(data)
+        x, y = data["x"], data["y"]
+
+        beta = KalmanBeta(**kalman).run(
+            x.iloc[kalman_start:end], y.iloc[kalman_start:end]
+        ).reindex(x.index)
+        data["beta"] = beta
+        data["spread"] = SpreadBuilder.build(x, y, beta)
+
+    wf = WalkForwardEngine(
+        data, copy.deepcopy(modules),
+        start_index=warm_start, end_index=end,
+    )
+    wf.run()
+
+    skip = start - warm_start
+    return {name: outs[skip:] for name, outs in wf.outputs.items()}
+
+
+# ==================================================
+# SHARDED ENGINE
+# ==================================================
+
+class ShardedWalkForward:
+    """
+    Time-sharded walk-forward for one long history
+
+    - Timeline [start_index, T) split into `n_shards` blocks
+    - Shard k replays `warmup` bars before its block on fresh
+      copies of the modules (state burn-in), then keeps only
+      its own block → shards are independent processes
+    - Module history windows (MIN_WINDOW, ZScoreSignal.window)
+      read the shared data, so only *state* needs the warm-up
+    - kalman=dict(...) → each shard re-runs KalmanBeta from
+      `warmup` bars before the earliest bar it reads, instead
+      of using the precomputed spread / beta
+    - SpreadBacktest equity is re-compounded across shard
+      boundaries from the stitched pnl
+
+    divergence() compares against a sequential run, per shard
+    and column, to pick a safe warm-up length.
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        modules: List[Any],
+        n_shards: int = 4,
+        warmup: int = 250,
+        start_index: int = 0,
+        max_workers: int | None = None,
+        kalman: dict | None = None,
+    ):
+        self.data = data
+        self.modules = modules
+        self.n_shards = n_shards
+        self.warmup = warmup
+        self.start_index = start_index
+        self.max_workers = max_workers or n_shards
+        self.kalman = kalman
+
+        self.outputs: Dict[str, list] = {}
+        self.bounds: List[tuple] = []
+
+    # ====================================================
+    # RUN
+    # ====================================================
+
+    def shards(self) -> List[tuple]:
+        """
+        (warm_start, start, end) per shard
+        """
+        T = WalkForwardEngine(self.data, [])._infer_length()
+        edges = np.linspace(
+            self.start_index, T, self.n_shards + 1
+        ).round().astype(int)
+
+        return [
+            (max(self.start_index, s - self.warmup), int(s), int(e))
+            for s, e in zip(edges[:-1], edges[1:])
+            if e > s
+        ]
+
+    def run(self) -> Dict[str, list]:
+        self.bounds = self.shards()
+        lookback = max(
+            (getattr(m, "lookback", 0) for m in self.modules), default=0
+        )
+
+        jobs = [
+            (
+                self.data, self.modules, warm, start, end,
+                self.kalman, max(0, warm - lookback - self.warmup),
+            )
+            for warm, start, end in self.bounds
+        ]
+
+        if self.max_workers <= 1:
+            parts = [_run_shard(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                parts = list(pool.map(_run_shard, *zip(*jobs)))
+
+        self.outputs = {
+            name: [o for part in parts for o in part[name]]
+            for name in parts[0]
+        }
+        self._compound_equity()
+        return self.outputs
+
+    def _compound_equity(self):
+        """
+        Shards start at equity 1.0 → rebuild from pnl
+        """
+        for m in self.modules:
+            name = module_name(m)
+            if not isinstance(m, SpreadBacktest) or name not in self.outputs:
+                continue
+
+            equity = 1.0
+            for out in self.outputs[name]:
+                if out is None:
+                    continue
+                equity *= 1.0 + out["pnl"]
+                if isinstance(out, dict):
+                    out["equity"] = equity
+                else:
+                    out.equity = equity
+
+    def frames(self, index: pd.Index | None = None) -> Dict[str, pd.DataFrame]:
+        """
+        Same layout as WalkForwardEngine.frames() (bars from
+        start_index on)
+        """
+        wf = WalkForwardEngine(self.data, self.modules)
+        wf.outputs = self.outputs
+        return wf.frames(index=index)
+
+    # ====================================================
+    # DIVERGENCE
+    # ====================================================
+
+    def sequential(self) -> WalkForwardEngine:
+        """
+        Reference single-process run on copies of the modules
+        (same Kalman treatment as the shards)
+        """
+        outputs = _run_shard(
+            self.data, self.modules,
+            self.start_index, self.start_index, None,
+            self.kalman, 0,
+        )
+        wf = WalkForwardEngine(self.data, self.modules)
+        wf.outputs = outputs
+        return wf
+
+    def divergence(
+        self,
+        reference: WalkForwardEngine | None = None,
+        tol: float = 1e-9,
+    ) -> pd.DataFrame:
+        """
+        Per shard / module / numeric column:
+
+            max_abs_diff : largest |sharded - sequential|
+            mismatch     : fraction of bars differing by > tol
+            settle_bars  : bars after the shard start until the
+                           last mismatch (0 → exact from the start)
+        """
+        if not self.outputs:
+            self.run()
+        reference = reference or self.sequential()
+
+        ours = self.frames()
+        theirs = reference.frames()
+
+        rows = []
+        for name, df in ours.items():
+            ref = theirs[name]
+            cols = [
+                c for c in df.columns
+                if c in ref and pd.api.types.is_numeric_dtype(df[c])
+            ]
+
+            pos = 0
+            for k, (_, start, end) in enumerate(self.bounds):
+                n = end - start
+                for col in cols:
+                    a = df[col].to_numpy(dtype=float)[pos:pos + n]
+                    b = ref[col].to_numpy(dtype=float)[pos:pos + n]
+
+                    diff = np.abs(a - b)
+                    both_nan = np.isnan(a) & np.isnan(b)
+                    diff[both_nan] = 0.0
+                    diff[np.isnan(diff)] = np.inf
+                    bad = np.flatnonzero(diff > tol)
+
+                    rows.append({
+                        "shard": k,
+                        "start": start,
+                        "module": name,
+                        "column": col,
+                        "max_abs_diff": diff.max() if n else 0.0,
+                        "mismatch": len(bad) / n if n else 0.0,
+                        "settle_bars": int(bad[-1]) + 1 if len(bad) else 0,
+                    })
+                pos += n
+
+        return pd.DataFrame(rows)